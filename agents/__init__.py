@@ -2,22 +2,27 @@
 Fenyr Multi-Agent Trading System
 """
 
-from .base import BaseAgent, AgentDecision, Signal, Action
+from .base import BaseAgent, AgentDecision, Signal, Action, configure_logging, create_openai_client, validate_config
 from .market_analyst import MarketAnalystAgent
 from .sentiment import SentimentAgent
 from .risk_manager import RiskManagerAgent
 from .executor import ExecutorAgent
 from .coordinator import CoordinatorAgent, TeamDecision
+from .batch_logger import BatchLogger
 
 __all__ = [
     "BaseAgent",
     "AgentDecision",
     "Signal",
     "Action",
+    "configure_logging",
+    "create_openai_client",
+    "validate_config",
     "MarketAnalystAgent",
     "SentimentAgent",
     "RiskManagerAgent",
     "ExecutorAgent",
     "CoordinatorAgent",
-    "TeamDecision"
+    "TeamDecision",
+    "BatchLogger"
 ]
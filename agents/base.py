@@ -4,13 +4,120 @@ All specialized agents inherit from this base class
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Any, Optional, Callable, List
+from datetime import datetime, timezone
+import atexit
+import hashlib
 import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
 
-from openai import OpenAI
+import httpx
+import orjson
+from cachetools import TTLCache
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+
+# Shared pool for WEEX REST fetches. Kept separate from the Coordinator's
+# agent pool so an agent running on a worker never waits on its own pool.
+_FETCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fenyr-fetch")
+
+# Decodes exactly one JSON value from an offset, ignoring whatever follows it
+_JSON_DECODER = json.JSONDecoder()
+
+
+def create_openai_client(api_key: str, max_connections: int = 64) -> "OpenAI":
+    """
+    Create an OpenAI client on a pooled HTTP/2 keep-alive connection.
+    
+    Share one instance across all agents so completions reuse warm
+    TLS connections instead of handshaking per call. The SDK (about half
+    a second to import) is only loaded here, when a client is first made.
+    """
+    from openai import OpenAI
+    
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=max_connections // 2,
+            max_connections=max_connections,
+            keepalive_expiry=60.0
+        ),
+        timeout=60.0
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
+
+
+# Settings both entry points need before they connect to anything
+REQUIRED_CONFIG = (
+    "OPENAI_API_KEY", "WEEX_API_KEY", "WEEX_SECRET_KEY", "WEEX_PASSPHRASE", "WEEX_BASE_URL",
+    "GPT_MODEL", "MAX_POSITION_SIZE_BTC"
+)
+
+
+def validate_config():
+    """
+    Import config.py and check every REQUIRED_CONFIG entry is set; returns
+    the module. Exits with a readable message otherwise, so a bad config
+    fails before any network work.
+    """
+    try:
+        import config
+    except ImportError:
+        sys.exit("❌ config.py not found - copy config.example.py to config.py and fill in your keys")
+    
+    missing = [key for key in REQUIRED_CONFIG if not getattr(config, key, None)]
+    if missing:
+        sys.exit(f"❌ config.py is missing: {', '.join(missing)}")
+    return config
+
+
+def configure_logging(level: int = logging.INFO):
+    """
+    Route log records through a queue so agent threads never block on
+    stdout; a single listener thread writes them out as plain lines.
+    Entry points log their own output too, so it stays in order with the
+    agents' lines.
+    """
+    records = queue.SimpleQueue()
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(records, output)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    # httpx logs every OpenAI request at INFO
+    logging.getLogger("httpx").setLevel(max(level, logging.WARNING))
+    
+    listener.start()
+    atexit.register(listener.stop)
+
+
+# (epoch second, ISO string) of the last decision timestamp. One tuple so
+# concurrent readers never see a second paired with another second's string.
+_timestamp_cache = (0, "")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as ISO-8601 at second resolution, formatted once per second"""
+    global _timestamp_cache
+    sec = int(time.time())
+    cached_sec, cached_iso = _timestamp_cache
+    if sec != cached_sec:
+        cached_iso = datetime.fromtimestamp(sec, tz=timezone.utc).isoformat()
+        _timestamp_cache = (sec, cached_iso)
+    return cached_iso
 
 
 class Signal(Enum):
@@ -33,7 +140,7 @@ class Action(Enum):
     ALERT = "alert"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentDecision:
     """Decision output from an agent"""
     agent_name: str
@@ -42,11 +149,7 @@ class AgentDecision:
     confidence: float
     reasoning: str
     data: Dict[str, Any]
-    timestamp: str = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.utcnow().isoformat()
+    timestamp: str = field(default_factory=_utc_timestamp)
     
     def to_ai_log(self) -> Dict[str, Any]:
         """Convert to WEEX AI Log format"""
@@ -67,53 +170,218 @@ class AgentDecision:
 class BaseAgent(ABC):
     """Base class for all trading agents"""
     
+    # JSON schema of the agent's answer, for fused structured-output calls
+    RESPONSE_SCHEMA: Optional[Dict[str, Any]] = None
+    
     def __init__(
         self,
         name: str,
         stage: str,
-        openai_client: OpenAI,
+        openai_client: "OpenAI",
         weex_client,
-        model: str = "gpt-5.2"
+        model: str = "gpt-5.2",
+        cache_size: int = 1000,
+        cache_ttl: float = 60
     ):
         self.name = name
         self.stage = stage
         self.openai = openai_client
         self.weex = weex_client
         self.model = model
+        
+        self._system_prompt: Optional[str] = None
+        
+        # Bounded LRU+TTL cache of GPT responses for unchanged contexts
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._cache_lock = threading.Lock()
+        
+        # Optional semaphore shared across a team to cap in-flight completions
+        self.gpt_slots: Optional[threading.BoundedSemaphore] = None
     
     @abstractmethod
     def get_system_prompt(self) -> str:
         """Return the system prompt for this agent"""
         pass
     
+    @property
+    def system_prompt(self) -> str:
+        """
+        System prompt, built once on first use. Sending byte-identical text
+        on every call also lets the provider's prompt cache kick in.
+        """
+        if self._system_prompt is None:
+            self._system_prompt = self.get_system_prompt()
+        return self._system_prompt
+    
     @abstractmethod
     def analyze(self, context: Dict[str, Any]) -> AgentDecision:
         """Perform analysis and return decision"""
         pass
     
+    def fetch_concurrently(
+        self,
+        snapshot: Optional[Dict[str, Any]] = None,
+        **calls: Callable[[], Any]
+    ) -> Dict[str, Any]:
+        """
+        Run independent WEEX requests in parallel.
+        
+        Args:
+            snapshot: Already-fetched data (see CoordinatorAgent._fetch_snapshot);
+                keys present here are reused instead of re-fetched
+            **calls: Zero-argument callables keyed by result name
+        
+        Returns:
+            Dict mapping each key to its call's result (exceptions are re-raised)
+        """
+        snapshot = snapshot or {}
+        futures = {
+            key: _FETCH_POOL.submit(call)
+            for key, call in calls.items() if key not in snapshot
+        }
+        return {
+            key: snapshot[key] if key in snapshot else futures[key].result()
+            for key in calls
+        }
+    
     def upload_ai_log(self, decision: AgentDecision, order_id: Optional[int] = None) -> Dict:
         """Upload AI log to WEEX"""
+        return self.weex.upload_ai_log(**self._ai_log_args(decision, order_id))
+    
+    def upload_ai_log_async(self, decision: AgentDecision, order_id: Optional[int] = None) -> Future:
+        """Queue the AI log upload on the WEEX client's background pool"""
+        return self.weex.upload_ai_log_async(**self._ai_log_args(decision, order_id))
+    
+    @staticmethod
+    def _ai_log_args(decision: AgentDecision, order_id: Optional[int]) -> Dict[str, Any]:
         ai_log = decision.to_ai_log()
-        if order_id:
-            ai_log["orderId"] = order_id
-        
-        return self.weex.upload_ai_log(
-            stage=ai_log["stage"],
-            model=ai_log["model"],
-            input_data=ai_log["input"],
-            output_data=ai_log["output"],
-            explanation=ai_log["explanation"],
-            order_id=order_id
-        )
+        return {
+            "stage": ai_log["stage"],
+            "model": ai_log["model"],
+            "input_data": ai_log["input"],
+            "output_data": ai_log["output"],
+            "explanation": ai_log["explanation"],
+            "order_id": order_id
+        }
     
     def call_gpt(self, prompt: str, context: Dict[str, Any]) -> str:
-        """Call GPT with agent's system prompt"""
-        response = self.openai.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": self.get_system_prompt()},
-                {"role": "user", "content": f"{prompt}\n\nContext:\n{json.dumps(context, indent=2)}"}
-            ],
-            temperature=0.7
+        """
+        Call GPT with agent's system prompt (cached for identical inputs).
+        Requests JSON mode, so the system prompt must ask for JSON output.
+        """
+        system_prompt = self.system_prompt
+        key = hashlib.blake2b(
+            system_prompt.encode() + prompt.encode()
+            + orjson.dumps(context, option=orjson.OPT_SORT_KEYS, default=str)
+        ).hexdigest()
+        
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        with self.gpt_slots or nullcontext():
+            response = self.openai.chat.completions.create(
+                model=self.model,
+                messages=self._build_messages(system_prompt, prompt, context),
+                response_format={"type": "json_object"},
+                temperature=0.7
+            )
+        content = response.choices[0].message.content
+        
+        with self._cache_lock:
+            self._cache[key] = content
+        return content
+    
+    @staticmethod
+    def parse_json_response(response: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Extract the JSON object from a GPT response, or None if there is none"""
+        if not response:
+            return None
+        
+        # json_object mode normally returns nothing but the object
+        try:
+            result = orjson.loads(response)
+            return result if isinstance(result, dict) else None
+        except orjson.JSONDecodeError:
+            pass
+        
+        # Otherwise take the first "{" that starts a complete object; braces
+        # in surrounding prose are skipped
+        start = response.find("{")
+        while start != -1:
+            try:
+                result, _ = _JSON_DECODER.raw_decode(response, start)
+                if isinstance(result, dict):
+                    return result
+            except json.JSONDecodeError:
+                pass
+            start = response.find("{", start + 1)
+        return None
+    
+    def _build_messages(self, system_prompt: str, prompt: str, context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Build the chat messages for a prompt and its context"""
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"{prompt}\n\nContext:\n{orjson.dumps(context, default=str).decode()}"}
+        ]
+    
+    def call_gpt_batch(
+        self,
+        prompts: List[Dict[str, Any]],
+        poll_interval: float = 30.0
+    ) -> List[str]:
+        """
+        Run many prompts through the OpenAI Batch API (half price, separate
+        rate limits, results within 24h). Blocks until the batch finishes.
+        
+        Args:
+            prompts: List of {"prompt": str, "context": dict}
+            poll_interval: Seconds between batch status checks
+        
+        Returns:
+            Response text per prompt, in input order ("" for failed requests)
+        """
+        system_prompt = self.system_prompt
+        lines = [
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": self._build_messages(system_prompt, p["prompt"], p["context"]),
+                    "response_format": {"type": "json_object"},
+                    "temperature": 0.7
+                }
+            })
+            for i, p in enumerate(prompts)
+        ]
+        
+        input_file = self.openai.files.create(
+            file=(f"{self.name}_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
         )
-        return response.choices[0].message.content
+        batch = self.openai.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.openai.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"{self.name} batch {batch.id} ended with status {batch.status}")
+        
+        results = {}
+        for line in self.openai.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            body = (item.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or [{}]
+            results[item["custom_id"]] = choices[0].get("message", {}).get("content") or ""
+        
+        return [results.get(str(i), "") for i in range(len(prompts))]
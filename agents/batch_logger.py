@@ -0,0 +1,215 @@
+"""
+Batch Logger
+Queues non-urgent audit completions for the OpenAI Batch API
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Dict, List, Optional
+
+import orjson
+
+from .coordinator import TeamDecision
+
+logger = logging.getLogger(__name__)
+
+AUDIT_SYSTEM_PROMPT = """You are the Fenyr compliance auditor.
+
+You receive one completed team decision: the final action and each agent's
+signal, confidence and reasoning. Write a short retrospective rationale for
+the audit record: why the team acted as it did, which inputs carried the
+decision, and any disagreement between agents worth reviewing."""
+
+
+class BatchLogger:
+    """
+    Collects retrospective audit requests and submits them through the
+    OpenAI Batch API (half price, separate rate limits, results within 24h).
+    
+    Requests are appended to a JSONL file as they arrive, so nothing queued
+    is lost on restart. Once flush_interval seconds have passed since the
+    last submission, the file is uploaded as one batch and started afresh.
+    Submitted batch ids are kept in a sidecar file until collect_ready()
+    writes their rationales to results_path.
+    Only use this for work nobody waits on - realtime decisions and orders
+    stay on the synchronous API.
+    """
+    
+    def __init__(self, openai_client, model: str = "gpt-5.2",
+                 path: str = "fenyr_audit_batch.jsonl",
+                 flush_interval: float = 3600,
+                 results_path: str = "fenyr_audit_results.jsonl",
+                 executor: Optional[Executor] = None):
+        self.openai = openai_client
+        self.model = model
+        self.path = path
+        self.flush_interval = flush_interval
+        self.results_path = results_path
+        self.executor = executor  # runs due flushes off the caller's thread
+        
+        self._staged_path = path + ".submitting"  # queue being uploaded
+        self._batches_path = path + ".batches"    # submitted, not yet collected
+        self._last_flush = time.monotonic()
+        self._flush_future: Optional[Future] = None
+        self._lock = threading.Lock()       # queue file appends/rotation
+        self._flush_lock = threading.Lock() # one upload at a time
+    
+    @property
+    def pending(self) -> List[str]:
+        """Submitted batch ids not yet collected, oldest first"""
+        if not os.path.exists(self._batches_path):
+            return []
+        with open(self._batches_path, "rb") as f:
+            return orjson.loads(f.read())
+    
+    def _save_pending(self, batch_ids: List[str]):
+        tmp = self._batches_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(batch_ids))
+        os.replace(tmp, self._batches_path)
+    
+    def record(self, custom_id: str, decision: TeamDecision):
+        """Queue a retrospective rationale request for one team decision"""
+        summary = {
+            "action": decision.action.value,
+            "direction": decision.trade_direction,
+            "size": decision.size,
+            "confidence": decision.confidence,
+            "agents": {
+                d.agent_name: {
+                    "signal": d.signal.value,
+                    "confidence": d.confidence,
+                    "reasoning": d.reasoning
+                }
+                for d in decision.agent_decisions
+            }
+        }
+        line = orjson.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": AUDIT_SYSTEM_PROMPT},
+                    {"role": "user", "content": orjson.dumps(summary, default=str).decode()}
+                ]
+            }
+        }, default=str)
+        
+        with self._lock:
+            with open(self.path, "ab") as f:
+                f.write(line + b"\n")
+        
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self._last_flush = time.monotonic()
+            if self.executor is None:
+                self.flush()
+            elif self._flush_future is None or self._flush_future.done():
+                self._flush_future = self.executor.submit(self._flush_logged)
+    
+    def _flush_logged(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning("⚠️ Audit batch submission failed, will retry: %s", e)
+    
+    def flush(self) -> Optional[str]:
+        """Submit everything queued so far as one batch; returns its id"""
+        with self._flush_lock:
+            self._last_flush = time.monotonic()
+            
+            # Move the queue aside so record() keeps appending while we
+            # upload; a staged file left by a failed upload goes first
+            with self._lock:
+                if not os.path.exists(self._staged_path):
+                    if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                        return None
+                    os.replace(self.path, self._staged_path)
+            
+            with open(self._staged_path, "rb") as f:
+                payload = f.read()
+            
+            input_file = self.openai.files.create(
+                file=(os.path.basename(self.path), payload),
+                purpose="batch"
+            )
+            batch = self.openai.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            # Only drop the queue once the batch id is on disk
+            self._save_pending(self.pending + [batch.id])
+            os.remove(self._staged_path)
+        
+        logger.info("📨 Submitted audit batch %s (%d requests)", batch.id, payload.count(b"\n"))
+        return batch.id
+    
+    def collect(self, batch_id: str) -> Optional[Dict[str, str]]:
+        """
+        Rationale text per custom_id for a finished batch, or None while it
+        is still running. Raises RuntimeError if the batch failed or expired.
+        """
+        batch = self.openai.batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"audit batch {batch_id} ended with status {batch.status}")
+        if batch.status != "completed" or not batch.output_file_id:
+            return None
+        
+        results = {}
+        for line in self.openai.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            body = (item.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or [{}]
+            results[item["custom_id"]] = choices[0].get("message", {}).get("content") or ""
+        return results
+    
+    def collect_ready(self) -> int:
+        """
+        Append the rationales of every finished pending batch to
+        results_path and forget those batches; returns how many were written.
+        Batches still running stay pending for the next call.
+        """
+        with self._flush_lock:
+            still_pending = []
+            written = 0
+            for batch_id in self.pending:
+                try:
+                    results = self.collect(batch_id)
+                except RuntimeError as e:
+                    logger.warning("⚠️ %s", e)
+                    continue
+                except Exception as e:
+                    logger.warning("⚠️ Could not check audit batch %s: %s", batch_id, e)
+                    still_pending.append(batch_id)
+                    continue
+                if results is None:
+                    still_pending.append(batch_id)
+                    continue
+                
+                with open(self.results_path, "ab") as f:
+                    for custom_id, rationale in results.items():
+                        f.write(orjson.dumps({
+                            "batch_id": batch_id,
+                            "custom_id": custom_id,
+                            "rationale": rationale
+                        }) + b"\n")
+                written += len(results)
+            
+            self._save_pending(still_pending)
+        
+        if written:
+            logger.info("📥 Collected %d audit rationales into %s", written, self.results_path)
+        return written
+    
+    def close(self):
+        """Submit whatever is still queued and collect finished batches"""
+        self._flush_logged()
+        self.collect_ready()
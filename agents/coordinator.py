@@ -3,18 +3,42 @@ Coordinator Agent
 Orchestrates the team and makes final decisions
 """
 
-import json
-from typing import Dict, Any, List
+import asyncio
+import logging
+import threading
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+import orjson
+
 from .base import BaseAgent, AgentDecision, Signal, Action
 from .market_analyst import MarketAnalystAgent
 from .sentiment import SentimentAgent
 from .risk_manager import RiskManagerAgent
 from .executor import ExecutorAgent
 
+logger = logging.getLogger(__name__)
+
+_RULE = "=" * 60
+
+# Vote direction of each signal (REJECT is handled as a veto before voting)
+_SIGNAL_DIRECTION = {
+    Signal.BUY: "buy",
+    Signal.BULLISH: "buy",
+    Signal.APPROVE: "buy",
+    Signal.SELL: "sell",
+    Signal.BEARISH: "sell",
+    Signal.HOLD: "hold",
+    Signal.NEUTRAL: "hold",
+    Signal.REDUCE: "hold",
+    Signal.REJECT: "hold"
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class TeamDecision:
     """Final decision from agent team"""
     action: Action
@@ -29,7 +53,10 @@ class CoordinatorAgent(BaseAgent):
     """Orchestrates the multi-agent team"""
     
     def __init__(self, openai_client, weex_client, model: str = "gpt-5.2",
-                 max_position_size: float = 0.0002):
+                 max_position_size: float = 0.0002,
+                 max_concurrency: int = 3,
+                 multiplex_gpt: bool = False,
+                 max_gpt_concurrency: int = 8):
         super().__init__(
             name="Coordinator",
             stage="Decision Making",
@@ -38,12 +65,26 @@ class CoordinatorAgent(BaseAgent):
             model=model
         )
         self.max_position_size = max_position_size
+        self.multiplex_gpt = multiplex_gpt
         
         # Initialize team
         self.market_analyst = MarketAnalystAgent(openai_client, weex_client, model)
         self.sentiment_agent = SentimentAgent(openai_client, weex_client, model)
         self.risk_manager = RiskManagerAgent(openai_client, weex_client, model, max_position_size)
         self.executor = ExecutorAgent(openai_client, weex_client, model)
+        
+        # One cap on in-flight completions for the whole team, so concurrent
+        # ticks (arun_team_analysis over several symbols) stay under rate limits
+        self.gpt_slots = threading.BoundedSemaphore(max_gpt_concurrency)
+        for agent in (self.market_analyst, self.sentiment_agent, self.risk_manager, self.executor):
+            agent.gpt_slots = self.gpt_slots
+        
+        # Worker pool for independent agent analyses (caps concurrent GPT/WEEX calls)
+        self.max_concurrency = max_concurrency
+        self._team_pool = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="fenyr-agent"
+        )
     
     def get_system_prompt(self) -> str:
         return """You are the Coordinator Agent, the leader of the trading team.
@@ -66,44 +107,63 @@ Thresholds:
 
 If Risk Manager says REJECT, always HOLD regardless of other signals."""
     
+    # Voting weights
+    VOTE_WEIGHTS = {
+        "MarketAnalyst": 0.35,
+        "SentimentAgent": 0.25,
+        "RiskManager": 0.40
+    }
+    
     def calculate_consensus(self, decisions: Dict[str, AgentDecision]) -> Dict[str, Any]:
         """Calculate weighted consensus from agent decisions"""
         
-        weights = {
-            "MarketAnalyst": 0.35,
-            "SentimentAgent": 0.25,
-            "RiskManager": 0.40
-        }
+        # Consensus depends only on each agent's (signal, confidence), so an
+        # unchanged tick is a cache lookup
+        votes = tuple(sorted(
+            (name, d.signal, d.confidence)
+            for name, d in decisions.items() if name in self.VOTE_WEIGHTS
+        ))
+        consensus = self._consensus_from_votes(votes)
+        
+        # Copy so callers can't mutate the cached result
+        return {**consensus, "votes": dict(consensus["votes"])}
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _consensus_from_votes(votes: Tuple[Tuple[str, Signal, float], ...]) -> Dict[str, Any]:
+        """Confidence-weighted majority vote over (agent, signal, confidence) tuples"""
         
         # Check for risk veto
-        risk_decision = decisions.get("RiskManager")
-        if risk_decision and risk_decision.signal == Signal.REJECT:
+        if any(name == "RiskManager" and signal == Signal.REJECT for name, signal, _ in votes):
             return {
                 "action": Action.HOLD,
                 "confidence": 0.0,
+                "direction": "none",
+                "votes": {"buy": 0.0, "sell": 0.0, "hold": 0.0},
+                "margin": 0.0,
                 "reason": "Risk Manager veto - trade rejected"
             }
         
-        # Calculate weighted score
-        total_score = 0
-        direction_votes = {"buy": 0, "sell": 0, "hold": 0}
+        # Array ops: each agent contributes weight * confidence to its direction
+        n = len(votes)
+        weights = np.fromiter((CoordinatorAgent.VOTE_WEIGHTS[name] for name, _, _ in votes), dtype=np.float64, count=n)
+        confidences = np.fromiter((c for _, _, c in votes), dtype=np.float64, count=n)
+        directions = [_SIGNAL_DIRECTION[s] for _, s, _ in votes]
+        buy_mask = np.fromiter((d == "buy" for d in directions), dtype=bool, count=n)
+        sell_mask = np.fromiter((d == "sell" for d in directions), dtype=bool, count=n)
+        hold_mask = ~(buy_mask | sell_mask)
         
-        for agent_name, decision in decisions.items():
-            if agent_name not in weights:
-                continue
-            
-            weight = weights[agent_name]
-            score = decision.confidence * weight
-            
-            # Determine direction
-            if decision.signal in [Signal.BUY, Signal.BULLISH, Signal.APPROVE]:
-                total_score += score
-                direction_votes["buy"] += weight
-            elif decision.signal in [Signal.SELL, Signal.BEARISH]:
-                total_score += score
-                direction_votes["sell"] += weight
-            else:
-                direction_votes["hold"] += weight
+        scores = weights * confidences
+        total_score = float(scores @ ~hold_mask)
+        direction_votes = {
+            "buy": float(scores @ buy_mask),
+            "sell": float(scores @ sell_mask),
+            "hold": float(scores @ hold_mask)
+        }
+        
+        # Winning margin as a share of all weighted confidence
+        total_weight = float(scores.sum())
+        margin = abs(direction_votes["buy"] - direction_votes["sell"]) / total_weight if total_weight > 0 else 0.0
         
         # Determine action and direction
         if total_score >= 0.65:
@@ -125,55 +185,238 @@ If Risk Manager says REJECT, always HOLD regardless of other signals."""
             "action": action,
             "confidence": total_score,
             "direction": direction,
-            "votes": direction_votes
+            "votes": direction_votes,
+            "margin": margin
         }
     
-    def run_team_analysis(self, symbol: str) -> TeamDecision:
-        """Run full team analysis and return decision"""
+    def _fetch_snapshot(self, symbol: str) -> Dict[str, Any]:
+        """
+        Fetch every WEEX input the team needs for one tick, once.
+        
+        Passed to agents as context["_snapshot"] so the Market Analyst, Sentiment
+        Agent and Risk Manager share one ticker instead of each fetching it.
+        """
+        market = self.weex.bind_symbol(symbol)
+        return self.fetch_concurrently(
+            ticker=market.ticker,
+            candles=lambda: market.candles("1h", 50),
+            depth=market.depth,
+            funding=market.funding_rate,
+            assets=self.weex.get_assets,
+            positions=self.weex.get_positions
+        )
+    
+    def _report(self, label: str, agent: BaseAgent, decision: AgentDecision):
+        """Log an agent's decision and queue its AI log upload"""
+        logger.info("\n%s", label)
+        logger.info("   Signal: %s | Confidence: %s", decision.signal.value, decision.confidence)
+        self._upload_in_background(agent, decision)
+    
+    @staticmethod
+    def _upload_in_background(agent: BaseAgent, decision: AgentDecision, order_id: Optional[int] = None):
+        """Queue an AI log upload; its outcome is logged whenever it lands"""
+        def done(future: Future):
+            try:
+                log = future.result()
+            except Exception as e:
+                logger.warning("📝 AI log %s: ❌ %s", agent.name, e)
+                return
+            logger.info("📝 AI log %s: %s", agent.name, "✅" if log.get("code") == "00000" else "❌")
         
-        print(f"\n{'='*60}")
-        print(f"🤖 MULTI-AGENT TEAM ANALYSIS: {symbol}")
-        print(f"{'='*60}\n")
+        agent.upload_ai_log_async(decision, order_id).add_done_callback(done)
+    
+    def _call_gpt_multiplex(
+        self,
+        system_prompts: Dict[str, str],
+        user_prompts: Dict[str, Dict[str, Any]],
+        schemas: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Dict[str, str]:
+        """
+        Send several agents' prompts in ONE chat completion.
         
-        decisions = {}
+        Context entries identical across every role (symbol, price, ...) are
+        sent once as shared_context. When every role has a schema, the reply
+        is constrained with a strict json_schema response format.
         
-        # 1. Market Analyst
-        print("📊 [1/4] Market Analyst analyzing...")
-        ma_decision = self.market_analyst.analyze({"symbol": symbol})
-        decisions["MarketAnalyst"] = ma_decision
-        print(f"   Signal: {ma_decision.signal.value} | Confidence: {ma_decision.confidence}")
+        Args:
+            system_prompts: Role name -> that agent's system prompt
+            user_prompts: Role name -> {"prompt": str, "context": dict}
+            schemas: Role name -> that agent's RESPONSE_SCHEMA (or None)
         
-        # Upload AI Log
-        ma_log = self.market_analyst.upload_ai_log(ma_decision)
-        print(f"   AI Log: {'✅' if ma_log.get('code') == '00000' else '❌'}")
+        Returns:
+            Role name -> JSON string of that role's answer
+        """
+        contexts = [p["context"] for p in user_prompts.values()]
+        shared = {
+            key: value for key, value in contexts[0].items()
+            if all(key in ctx and ctx[key] == value for ctx in contexts[1:])
+        }
+        tasks = [
+            {
+                "role": role,
+                "instructions": system_prompts[role],
+                "task": user_prompts[role]["prompt"],
+                "context": {k: v for k, v in user_prompts[role]["context"].items() if k not in shared}
+            }
+            for role in user_prompts
+        ]
+        roles = ", ".join(f'"{role}"' for role in user_prompts)
         
-        # 2. Sentiment Agent
-        print("\n💭 [2/4] Sentiment Agent analyzing...")
-        sa_decision = self.sentiment_agent.analyze({"symbol": symbol})
-        decisions["SentimentAgent"] = sa_decision
-        print(f"   Signal: {sa_decision.signal.value} | Confidence: {sa_decision.confidence}")
+        if all(schemas.get(role) for role in user_prompts):
+            response_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "team_analysis",
+                    "strict": True,
+                    "schema": {
+                        "type": "object",
+                        "properties": {role: schemas[role] for role in user_prompts},
+                        "required": list(user_prompts),
+                        "additionalProperties": False
+                    }
+                }
+            }
+        else:
+            response_format = {"type": "json_object"}
+        
+        with self.gpt_slots:
+            response = self.openai.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": (
+                        "You are the Fenyr trading team. Complete every sub-task below, "
+                        "each strictly in the role and output format its instructions describe. "
+                        "The risk_manager must assess the market_analyst signal from this same answer. "
+                        f"Reply with one JSON object whose keys are {roles} and whose values "
+                        "are each role's JSON answer."
+                    )},
+                    {"role": "user", "content": orjson.dumps(
+                        {"shared_context": shared, "tasks": tasks}, default=str
+                    ).decode()}
+                ],
+                response_format=response_format,
+                temperature=0.7
+            )
+        content = response.choices[0].message.content or ""
         
-        # Upload AI Log
-        sa_log = self.sentiment_agent.upload_ai_log(sa_decision)
-        print(f"   AI Log: {'✅' if sa_log.get('code') == '00000' else '❌'}")
+        try:
+            combined = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            combined = {}
+        if not isinstance(combined, dict):
+            combined = {}
         
-        # 3. Risk Manager
-        print("\n🛡️ [3/4] Risk Manager assessing...")
-        rm_context = {
-            "symbol": symbol,
+        # Roles missing from the reply fall back to each agent's own default parsing
+        return {
+            role: orjson.dumps(combined[role]).decode() if isinstance(combined.get(role), dict) else content
+            for role in user_prompts
+        }
+    
+    def _run_multiplexed_analyses(
+        self,
+        symbol: str,
+        snapshot: Dict[str, Any]
+    ) -> Tuple[AgentDecision, AgentDecision, AgentDecision]:
+        """Prepare all three analysts concurrently, then decide with a single GPT call"""
+        agents = {
+            "market_analyst": (self.market_analyst, {"symbol": symbol, "_snapshot": snapshot}),
+            "sentiment": (self.sentiment_agent, {"symbol": symbol, "_snapshot": snapshot}),
+            "risk_manager": (self.risk_manager, {
+                "symbol": symbol,
+                "proposal_from": "market_analyst",
+                "_snapshot": snapshot
+            })
+        }
+        
+        futures = {
+            role: self._team_pool.submit(agent.build_prompt, ctx)
+            for role, (agent, ctx) in agents.items()
+        }
+        prepared = {role: future.result() for role, future in futures.items()}
+        
+        responses = self._call_gpt_multiplex(
+            {role: agent.system_prompt for role, (agent, _) in agents.items()},
+            {role: {"prompt": prompt, "context": ctx} for role, (prompt, ctx) in prepared.items()},
+            {role: agent.RESPONSE_SCHEMA for role, (agent, _) in agents.items()}
+        )
+        
+        ma_decision, sa_decision, rm_decision = (
+            agent.parse_response(responses[role], prepared[role][1])
+            for role, (agent, _) in agents.items()
+        )
+        
+        # The risk manager assessed the analyst signal from this same answer;
+        # log that signal as its input now that it is known
+        rm_decision.data["input"] = {
+            **rm_decision.data["input"],
             "proposed_signal": ma_decision.signal.value,
             "proposed_confidence": ma_decision.confidence
         }
-        rm_decision = self.risk_manager.analyze(rm_context)
-        decisions["RiskManager"] = rm_decision
-        print(f"   Signal: {rm_decision.signal.value} | Confidence: {rm_decision.confidence}")
+        return ma_decision, sa_decision, rm_decision
+    
+    def run_team_analysis(self, symbol: str, snapshot: Optional[Dict[str, Any]] = None) -> TeamDecision:
+        """
+        Run full team analysis and return decision.
+        
+        Pass a snapshot (see _fetch_snapshot) to reuse market/account data
+        that was already fetched for this tick.
+        """
+        
+        logger.info("\n%s", _RULE)
+        logger.info("🤖 MULTI-AGENT TEAM ANALYSIS: %s", symbol)
+        logger.info("%s\n", _RULE)
         
-        # Upload AI Log
-        rm_log = self.risk_manager.upload_ai_log(rm_decision)
-        print(f"   AI Log: {'✅' if rm_log.get('code') == '00000' else '❌'}")
+        decisions = {}
+        
+        # Shared market/account data for this tick
+        if snapshot is None:
+            self.weex.new_cycle()
+            snapshot = self._fetch_snapshot(symbol)
+        
+        if self.multiplex_gpt:
+            # 1-3. One GPT request for all three analysts
+            logger.info("📦 [1-3/4] Market Analyst, Sentiment Agent and Risk Manager (single GPT call)...")
+            ma_decision, sa_decision, rm_decision = self._run_multiplexed_analyses(symbol, snapshot)
+            self._report("📊 Market Analyst", self.market_analyst, ma_decision)
+            self._report("💭 Sentiment Agent", self.sentiment_agent, sa_decision)
+            self._report("🛡️ Risk Manager", self.risk_manager, rm_decision)
+        else:
+            # 1+2. Market Analyst and Sentiment Agent are independent - run concurrently
+            logger.info("📊 [1/4] Market Analyst analyzing...")
+            logger.info("💭 [2/4] Sentiment Agent analyzing...")
+            ma_future = self._team_pool.submit(
+                self.market_analyst.analyze, {"symbol": symbol, "_snapshot": snapshot}
+            )
+            sa_future = self._team_pool.submit(
+                self.sentiment_agent.analyze, {"symbol": symbol, "_snapshot": snapshot}
+            )
+            
+            ma_decision = ma_future.result()
+            
+            # 3. Risk Manager only depends on the Market Analyst signal, so it can
+            # start while the Sentiment Agent is still running
+            rm_context = {
+                "symbol": symbol,
+                "proposed_signal": ma_decision.signal.value,
+                "proposed_confidence": ma_decision.confidence,
+                "_snapshot": snapshot
+            }
+            rm_future = self._team_pool.submit(self.risk_manager.analyze, rm_context)
+            self._report("📊 Market Analyst", self.market_analyst, ma_decision)
+            
+            sa_decision = sa_future.result()
+            self._report("💭 Sentiment Agent", self.sentiment_agent, sa_decision)
+            
+            logger.info("\n🛡️ [3/4] Risk Manager assessing...")
+            rm_decision = rm_future.result()
+            self._report("🛡️ Risk Manager", self.risk_manager, rm_decision)
+        
+        decisions["MarketAnalyst"] = ma_decision
+        decisions["SentimentAgent"] = sa_decision
+        decisions["RiskManager"] = rm_decision
         
         # 4. Coordinator consensus
-        print("\n🎯 [4/4] Coordinator calculating consensus...")
+        logger.info("\n🎯 [4/4] Coordinator calculating consensus...")
         consensus = self.calculate_consensus(decisions)
         
         # Get recommended size from risk manager
@@ -194,42 +437,42 @@ If Risk Manager says REJECT, always HOLD regardless of other signals."""
                     "action": consensus["action"].value,
                     "confidence": consensus["confidence"],
                     "direction": consensus["direction"],
-                    "votes": consensus["votes"]
+                    "votes": consensus["votes"],
+                    "margin": consensus["margin"]
                 }
             }
         )
         
         # Upload Coordinator AI Log
-        coord_log = self.upload_ai_log(coord_decision)
-        print(f"   Decision: {consensus['action'].value} | Confidence: {consensus['confidence']:.2f}")
-        print(f"   AI Log: {'✅' if coord_log.get('code') == '00000' else '❌'}")
+        self._upload_in_background(self, coord_decision)
+        logger.info("   Decision: %s | Confidence: %.2f", consensus["action"].value, consensus["confidence"])
         
         # 5. Execute if needed
         execution_decision = None
         if consensus["action"] == Action.EXECUTE and consensus["direction"] in ["buy", "sell"]:
-            print(f"\n⚡ [5/5] Executor placing order...")
+            logger.info("\n⚡ [5/5] Executor placing order...")
             
             exec_context = {
                 "action": "execute",
                 "symbol": symbol,
                 "size": recommended_size,
                 "trade_direction": consensus["direction"],
-                "reasoning": coord_reasoning
+                "reasoning": coord_reasoning,
+                "reference_price": float(snapshot["ticker"].get("last", 0))
             }
             
             execution_decision = self.executor.analyze(exec_context)
             
             # Get order ID and upload AI Log
             order_id = execution_decision.data.get("output", {}).get("order_id")
-            exec_log = self.executor.upload_ai_log(execution_decision, order_id=int(order_id) if order_id else None)
-            print(f"   Order ID: {order_id}")
-            print(f"   AI Log: {'✅' if exec_log.get('code') == '00000' else '❌'}")
+            self._upload_in_background(self.executor, execution_decision, int(order_id) if order_id else None)
+            logger.info("   Order ID: %s", order_id)
         else:
-            print(f"\n⏸️ [5/5] No execution - {consensus['action'].value}")
+            logger.info("\n⏸️ [5/5] No execution - %s", consensus["action"].value)
         
-        print(f"\n{'='*60}")
-        print(f"✅ TEAM ANALYSIS COMPLETE")
-        print(f"{'='*60}\n")
+        logger.info("\n%s", _RULE)
+        logger.info("✅ TEAM ANALYSIS COMPLETE")
+        logger.info("%s\n", _RULE)
         
         return TeamDecision(
             action=consensus["action"],
@@ -240,6 +483,63 @@ If Risk Manager says REJECT, always HOLD regardless of other signals."""
             agent_decisions=list(decisions.values()) + ([execution_decision] if execution_decision else [])
         )
     
+    async def arun_team_analysis(self, symbol: str) -> TeamDecision:
+        """
+        Async entry point for event-loop callers (multi_agent.py --async).
+        
+        With an AsyncWeexClient the tick's snapshot is fetched over HTTP/2 on
+        the loop; the GPT calls and order placement then run on a worker
+        thread so the loop is never blocked.
+        """
+        self.weex.new_cycle()
+        if hasattr(self.weex, "afetch_snapshot"):
+            snapshot = await self.weex.afetch_snapshot(symbol)
+        else:
+            snapshot = await asyncio.to_thread(self._fetch_snapshot, symbol)
+        return await asyncio.to_thread(self.run_team_analysis, symbol, snapshot)
+    
+    def run_team_analysis_batch(self, symbols: List[str]) -> Dict[str, Dict[str, AgentDecision]]:
+        """
+        Scan many symbols through the OpenAI Batch API.
+        
+        For non-urgent work (periodic scans, backtests) only - results can take
+        up to 24h. Runs the Market Analyst and Sentiment Agent; no orders are
+        placed and no AI logs are uploaded. Library-only: no entry point
+        calls this.
+        
+        The scan runs on its own short-lived pool, never on _team_pool, so
+        a batch waiting on OpenAI does not hold the workers live cycles need.
+        
+        Returns:
+            Symbol -> {"MarketAnalyst": decision, "SentimentAgent": decision}
+        """
+        agents = {"MarketAnalyst": self.market_analyst, "SentimentAgent": self.sentiment_agent}
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                thread_name_prefix="fenyr-batch") as pool:
+            # Fetch market data for every (agent, symbol) pair
+            prepared = {
+                name: [pool.submit(agent.build_prompt, {"symbol": s}) for s in symbols]
+                for name, agent in agents.items()
+            }
+            prepared = {name: [f.result() for f in futures] for name, futures in prepared.items()}
+            
+            # One batch per agent (each has its own system prompt), submitted together
+            batches = {
+                name: pool.submit(
+                    agent.call_gpt_batch,
+                    [{"prompt": prompt, "context": ctx} for prompt, ctx in prepared[name]]
+                )
+                for name, agent in agents.items()
+            }
+            responses = {name: future.result() for name, future in batches.items()}
+        
+        results = {symbol: {} for symbol in symbols}
+        for name, agent in agents.items():
+            for i, symbol in enumerate(symbols):
+                results[symbol][name] = agent.parse_response(responses[name][i], prepared[name][i][1])
+        return results
+    
     def analyze(self, context: Dict[str, Any]) -> AgentDecision:
         """Coordinator analysis (wraps team analysis)"""
         symbol = context.get("symbol", "cmt_btcusdt")
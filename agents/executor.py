@@ -38,9 +38,15 @@ Report execution status clearly."""
         symbol: str,
         action: str,  # "buy" or "sell"
         size: str,
-        reasoning: str
+        reasoning: str,
+        reference_price: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Execute a market order"""
+        """
+        Execute a market order.
+        
+        The order is sent first; reference_price (e.g. the tick's snapshot
+        ticker) is only reported, and fetched after placement if not given.
+        """
         
         # Map action to WEEX side
         # 1=open_long, 2=close_short, 3=open_short, 4=close_long
@@ -50,28 +56,28 @@ Report execution status clearly."""
         }
         side = side_map.get(action.lower(), 1)
         
-        # Get current price
-        ticker = self.weex.get_ticker(symbol)
-        current_price = float(ticker.get("last", 0))
-        
         # Place market order
         order_result = self.weex.place_order(
             symbol=symbol,
             size=size,
             side=side,
             order_type=1,  # Market order
-            client_oid=f"fenyr_multi_{int(time.time() * 1000)}"
+            client_oid=f"fenyr_multi_{time.time_ns() // 1_000_000}"
         )
         
         order_id = order_result.get("order_id")
         
+        # Reference price for reporting only - never delays the order
+        if reference_price is None:
+            reference_price = float(self.weex.get_ticker(symbol).get("last", 0))
+        
         return {
             "success": order_id is not None,
             "order_id": order_id,
             "symbol": symbol,
             "action": action,
             "size": size,
-            "fill_price": current_price,
+            "fill_price": reference_price,
             "reasoning": reasoning
         }
     
@@ -87,7 +93,10 @@ Report execution status clearly."""
             trade_action = context.get("trade_direction", "buy")
             
             # Execute the trade
-            result = self.execute_trade(symbol, trade_action, size, reasoning)
+            result = self.execute_trade(
+                symbol, trade_action, size, reasoning,
+                reference_price=context.get("reference_price")
+            )
             
             signal = Signal.BUY if trade_action == "buy" else Signal.SELL
             
@@ -3,16 +3,28 @@ Market Analyst Agent
 Performs technical analysis on price data
 """
 
-import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import numpy as np
 
+import indicators
 from .base import BaseAgent, AgentDecision, Signal
 
 
 class MarketAnalystAgent(BaseAgent):
     """Agent specialized in technical analysis"""
     
+    # Structured-output schema of the JSON answer the system prompt asks for
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "signal": {"type": "string", "enum": ["BUY", "SELL", "NEUTRAL"]},
+            "confidence": {"type": "number"},
+            "reasoning": {"type": "string"}
+        },
+        "required": ["signal", "confidence", "reasoning"],
+        "additionalProperties": False
+    }
+    
     def __init__(self, openai_client, weex_client, model: str = "gpt-5.2"):
         super().__init__(
             name="MarketAnalyst",
@@ -45,52 +57,52 @@ Be precise and data-driven. Format your response as JSON:
         if not candles or len(candles) < 20:
             return {}
         
-        closes = [float(c[4]) for c in candles if isinstance(c, list) and len(c) > 4]
+        # Parse closes straight into a float64 buffer, no intermediate list
+        closes = np.fromiter(
+            (float(c[4]) for c in candles if isinstance(c, list) and len(c) > 4),
+            dtype=np.float64,
+            count=-1
+        )
+        if closes.size == 0:
+            return {}
         
-        # RSI
-        deltas = np.diff(closes)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        avg_gain = np.mean(gains[-14:]) if len(gains) >= 14 else 0
-        avg_loss = np.mean(losses[-14:]) if len(losses) >= 14 else 1
-        rs = avg_gain / avg_loss if avg_loss > 0 else 100
-        rsi = 100 - (100 / (1 + rs))
+        # RSI (Wilder smoothing, seeded with the first 14-period mean)
+        rsi = indicators.rsi(closes, 14)
         
         # EMAs
-        def ema(data, period):
-            multiplier = 2 / (period + 1)
-            result = data[0]
-            for price in data[1:]:
-                result = (price - result) * multiplier + result
-            return result
-        
-        ema_20 = ema(closes, 20)
-        ema_50 = ema(closes, 50) if len(closes) >= 50 else ema_20
+        ema_20 = indicators.ema(closes, 20)
+        ema_50 = indicators.ema(closes, 50) if len(closes) >= 50 else ema_20
         
         # MACD
-        ema_12 = ema(closes, 12)
-        ema_26 = ema(closes, 26) if len(closes) >= 26 else ema_12
+        ema_12 = indicators.ema(closes, 12)
+        ema_26 = indicators.ema(closes, 26) if len(closes) >= 26 else ema_12
         macd = ema_12 - ema_26
         
+        current_price = float(closes[-1])
+        
         return {
             "rsi_14": round(rsi, 2),
             "ema_20": round(ema_20, 2),
             "ema_50": round(ema_50, 2),
             "macd": round(macd, 2),
-            "current_price": closes[-1],
-            "price_above_ema20": closes[-1] > ema_20,
-            "price_above_ema50": closes[-1] > ema_50,
+            "current_price": current_price,
+            "price_above_ema20": current_price > ema_20,
+            "price_above_ema50": current_price > ema_50,
             "ema_bullish_cross": ema_20 > ema_50
         }
     
-    def analyze(self, context: Dict[str, Any]) -> AgentDecision:
-        """Analyze market using technical indicators"""
+    def build_prompt(self, context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Fetch data and build the GPT prompt and context"""
         symbol = context.get("symbol", "cmt_btcusdt")
         
-        # Fetch data
-        ticker = self.weex.get_ticker(symbol)
-        candles = self.weex.get_candles(symbol, "1h", 50)
-        depth = self.weex.get_depth(symbol)
+        # Fetch data (independent requests, fetched in parallel)
+        data = self.fetch_concurrently(
+            context.get("_snapshot"),
+            ticker=lambda: self.weex.get_ticker(symbol),
+            candles=lambda: self.weex.get_candles(symbol, "1h", 50),
+            depth=lambda: self.weex.get_depth(symbol)
+        )
+        ticker, candles, depth = data["ticker"], data["candles"], data["depth"]
         
         # Calculate indicators
         indicators = self.calculate_indicators(candles)
@@ -109,21 +121,14 @@ Be precise and data-driven. Format your response as JSON:
             }
         }
         
-        # Call GPT for analysis
+        # Prompt for analysis
         prompt = f"Analyze {symbol} and provide a trading signal based on the technical data."
-        response = self.call_gpt(prompt, analysis_context)
-        
+        return prompt, analysis_context
+    
+    def parse_response(self, response: str, analysis_context: Dict[str, Any]) -> AgentDecision:
+        """Turn a GPT response into an AgentDecision"""
         # Parse response
-        try:
-            # Try to extract JSON from response
-            start = response.find("{")
-            end = response.rfind("}") + 1
-            if start >= 0 and end > start:
-                result = json.loads(response[start:end])
-            else:
-                result = {"signal": "NEUTRAL", "confidence": 0.5, "reasoning": response}
-        except:
-            result = {"signal": "NEUTRAL", "confidence": 0.5, "reasoning": response}
+        result = self.parse_json_response(response) or {"signal": "NEUTRAL", "confidence": 0.5, "reasoning": response or ""}
         
         # Map signal
         signal_map = {
@@ -142,6 +147,12 @@ Be precise and data-driven. Format your response as JSON:
             reasoning=result.get("reasoning", ""),
             data={
                 "input": analysis_context,
-                "output": {"indicators": indicators}
+                "output": {"indicators": analysis_context["indicators"]}
             }
         )
+    
+    def analyze(self, context: Dict[str, Any]) -> AgentDecision:
+        """Analyze market using technical indicators"""
+        prompt, analysis_context = self.build_prompt(context)
+        response = self.call_gpt(prompt, analysis_context)
+        return self.parse_response(response, analysis_context)
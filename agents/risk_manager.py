@@ -3,8 +3,7 @@ Risk Manager Agent
 Assesses risk and determines position sizing
 """
 
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from .base import BaseAgent, AgentDecision, Signal
 
@@ -12,6 +11,19 @@ from .base import BaseAgent, AgentDecision, Signal
 class RiskManagerAgent(BaseAgent):
     """Agent specialized in risk management"""
     
+    # Structured-output schema of the JSON answer the system prompt asks for
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "signal": {"type": "string", "enum": ["APPROVE", "REDUCE", "REJECT"]},
+            "confidence": {"type": "number"},
+            "recommended_size": {"type": "number"},
+            "reasoning": {"type": "string"}
+        },
+        "required": ["signal", "confidence", "recommended_size", "reasoning"],
+        "additionalProperties": False
+    }
+    
     def __init__(self, openai_client, weex_client, model: str = "gpt-5.2", 
                  max_position_size: float = 0.0002,
                  max_risk_pct: float = 0.02):
@@ -49,41 +61,59 @@ Format your response as JSON:
     "reasoning": "Your risk assessment..."
 }}"""
     
-    def analyze(self, context: Dict[str, Any]) -> AgentDecision:
-        """Assess risk for proposed trade"""
+    @staticmethod
+    def _parse_account(assets: List[Dict], positions: List[Dict]) -> Tuple[Dict[str, Dict], List[Dict]]:
+        """Index assets by coin and extract open positions, one pass each"""
+        assets_by_coin = {a.get("coinName"): a for a in assets}
+        
+        active_positions = []
+        for p in positions:
+            total = p.get("total")
+            if total and float(total) > 0:
+                active_positions.append({
+                    "symbol": p.get("symbol"),
+                    "size": total,
+                    "side": p.get("holdSide"),
+                    "pnl": p.get("unrealizedPL")
+                })
+        
+        return assets_by_coin, active_positions
+    
+    def build_prompt(self, context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Fetch data and build the GPT prompt and context"""
         symbol = context.get("symbol", "cmt_btcusdt")
+        # Set in a fused call, where the proposal is another role's answer
+        # in the same reply and is not known yet
+        proposal_from = context.get("proposal_from")
         proposed_signal = context.get("proposed_signal", "BUY")
         proposed_confidence = context.get("proposed_confidence", 0.5)
         
-        # Fetch account data
-        assets = self.weex.get_assets()
-        positions = self.weex.get_positions()
+        # Fetch account data and current price in parallel
+        data = self.fetch_concurrently(
+            context.get("_snapshot"),
+            assets=self.weex.get_assets,
+            positions=self.weex.get_positions,
+            ticker=lambda: self.weex.get_ticker(symbol)
+        )
+        assets, positions, ticker = data["assets"], data["positions"], data["ticker"]
         
         # Parse account info
-        usdt_asset = next((a for a in assets if a.get("coinName") == "USDT"), {})
+        assets_by_coin, active_positions = self._parse_account(assets, positions)
+        usdt_asset = assets_by_coin.get("USDT", {})
         available = float(usdt_asset.get("available", 0))
         equity = float(usdt_asset.get("equity", 0))
         
-        # Check current exposure
-        active_positions = [
-            {
-                "symbol": p.get("symbol"),
-                "size": p.get("total"),
-                "side": p.get("holdSide"),
-                "pnl": p.get("unrealizedPL")
-            }
-            for p in positions if float(p.get("total", 0)) > 0
-        ]
-        
-        # Get current price
-        ticker = self.weex.get_ticker(symbol)
+        # Current price
         current_price = float(ticker.get("last", 0))
         
         # Build context
+        proposal = {} if proposal_from else {
+            "proposed_signal": proposed_signal,
+            "proposed_confidence": proposed_confidence
+        }
         risk_context = {
             "symbol": symbol,
-            "proposed_signal": proposed_signal,
-            "proposed_confidence": proposed_confidence,
+            **proposal,
             "account": {
                 "available_usdt": available,
                 "equity_usdt": equity,
@@ -97,20 +127,18 @@ Format your response as JSON:
             "current_price": current_price
         }
         
-        # Call GPT for assessment
-        prompt = f"Assess the risk for a potential {proposed_signal} trade on {symbol}. Should we proceed?"
-        response = self.call_gpt(prompt, risk_context)
-        
+        # Prompt for assessment
+        if proposal_from:
+            prompt = (f"Assess the risk of acting on the {proposal_from} signal for {symbol} "
+                      "given in this same answer. Should we proceed?")
+        else:
+            prompt = f"Assess the risk for a potential {proposed_signal} trade on {symbol}. Should we proceed?"
+        return prompt, risk_context
+    
+    def parse_response(self, response: str, risk_context: Dict[str, Any]) -> AgentDecision:
+        """Turn a GPT response into an AgentDecision"""
         # Parse response
-        try:
-            start = response.find("{")
-            end = response.rfind("}") + 1
-            if start >= 0 and end > start:
-                result = json.loads(response[start:end])
-            else:
-                result = {"signal": "APPROVE", "confidence": 0.7, "recommended_size": self.max_position_size, "reasoning": response}
-        except:
-            result = {"signal": "APPROVE", "confidence": 0.7, "recommended_size": self.max_position_size, "reasoning": response}
+        result = self.parse_json_response(response) or {"signal": "APPROVE", "confidence": 0.7, "recommended_size": self.max_position_size, "reasoning": response or ""}
         
         # Map signal
         signal_map = {
@@ -140,3 +168,9 @@ Format your response as JSON:
                 }
             }
         )
+    
+    def analyze(self, context: Dict[str, Any]) -> AgentDecision:
+        """Assess risk for proposed trade"""
+        prompt, risk_context = self.build_prompt(context)
+        response = self.call_gpt(prompt, risk_context)
+        return self.parse_response(response, risk_context)
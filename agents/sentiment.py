@@ -3,8 +3,7 @@ Sentiment Agent
 Analyzes market sentiment through funding rates and open interest
 """
 
-import json
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 from .base import BaseAgent, AgentDecision, Signal
 
@@ -12,6 +11,18 @@ from .base import BaseAgent, AgentDecision, Signal
 class SentimentAgent(BaseAgent):
     """Agent specialized in sentiment analysis"""
     
+    # Structured-output schema of the JSON answer the system prompt asks for
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "signal": {"type": "string", "enum": ["BULLISH", "BEARISH", "NEUTRAL"]},
+            "confidence": {"type": "number"},
+            "reasoning": {"type": "string"}
+        },
+        "required": ["signal", "confidence", "reasoning"],
+        "additionalProperties": False
+    }
+    
     def __init__(self, openai_client, weex_client, model: str = "gpt-5.2"):
         super().__init__(
             name="SentimentAgent",
@@ -40,20 +51,26 @@ Format your response as JSON:
     "reasoning": "Your sentiment analysis..."
 }"""
     
-    def analyze(self, context: Dict[str, Any]) -> AgentDecision:
-        """Analyze market sentiment"""
-        symbol = context.get("symbol", "cmt_btcusdt")
-        
-        # Fetch sentiment data
-        ticker = self.weex.get_ticker(symbol)
-        funding = self.weex.get_funding_rate(symbol)
-        
-        # Try to get open interest
+    def _get_open_interest(self, symbol: str) -> Any:
+        """Try to get open interest"""
         try:
             oi = self.weex.get_open_interest(symbol)
-            open_interest = oi.get("openInterestAmount", "N/A")
-        except:
-            open_interest = "N/A"
+            return oi.get("openInterestAmount", "N/A")
+        except Exception:
+            return "N/A"
+    
+    def build_prompt(self, context: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Fetch data and build the GPT prompt and context"""
+        symbol = context.get("symbol", "cmt_btcusdt")
+        
+        # Fetch sentiment data in parallel
+        data = self.fetch_concurrently(
+            context.get("_snapshot"),
+            ticker=lambda: self.weex.get_ticker(symbol),
+            funding=lambda: self.weex.get_funding_rate(symbol),
+            open_interest=lambda: self._get_open_interest(symbol)
+        )
+        ticker, funding, open_interest = data["ticker"], data["funding"], data["open_interest"]
         
         # Build context
         sentiment_context = {
@@ -66,20 +83,14 @@ Format your response as JSON:
             "current_price": ticker.get("last")
         }
         
-        # Call GPT for analysis
+        # Prompt for analysis
         prompt = f"Analyze the sentiment for {symbol} based on funding rates and market data."
-        response = self.call_gpt(prompt, sentiment_context)
-        
+        return prompt, sentiment_context
+    
+    def parse_response(self, response: str, sentiment_context: Dict[str, Any]) -> AgentDecision:
+        """Turn a GPT response into an AgentDecision"""
         # Parse response
-        try:
-            start = response.find("{")
-            end = response.rfind("}") + 1
-            if start >= 0 and end > start:
-                result = json.loads(response[start:end])
-            else:
-                result = {"signal": "NEUTRAL", "confidence": 0.5, "reasoning": response}
-        except:
-            result = {"signal": "NEUTRAL", "confidence": 0.5, "reasoning": response}
+        result = self.parse_json_response(response) or {"signal": "NEUTRAL", "confidence": 0.5, "reasoning": response or ""}
         
         # Map signal
         signal_map = {
@@ -98,8 +109,14 @@ Format your response as JSON:
             data={
                 "input": sentiment_context,
                 "output": {
-                    "funding_rate": funding.get("fundingRate"),
+                    "funding_rate": sentiment_context["funding_rate"],
                     "sentiment": result.get("signal")
                 }
             }
         )
+    
+    def analyze(self, context: Dict[str, Any]) -> AgentDecision:
+        """Analyze market sentiment"""
+        prompt, sentiment_context = self.build_prompt(context)
+        response = self.call_gpt(prompt, sentiment_context)
+        return self.parse_response(response, sentiment_context)
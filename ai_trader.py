@@ -3,66 +3,150 @@ Fenyr AI Trading Agent
 GPT-5.2 powered autonomous trading bot
 """
 
-import json
+import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-from openai import OpenAI
-import pandas as pd
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, Any, Callable, Optional, List, Tuple
+import orjson
 import numpy as np
 
+import indicators
 from weex_client import WeexClient
-from tools import TRADING_TOOLS, TRADING_SYSTEM_PROMPT, ACTION_TO_SIDE
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+from tools import TRADING_TOOLS, TRADING_SYSTEM_PROMPT, ACTION_TO_SIDE, WRITE_TOOLS
+
+
+logger = logging.getLogger(__name__)
+
+# Static prefix of every request, kept first and byte-identical so OpenAI's
+# server-side prompt cache can reuse it across turns
+_SYSTEM_MSG = ({"role": "system", "content": TRADING_SYSTEM_PROMPT.strip()},)
 
 class TechnicalAnalysis:
-    """Calculate technical indicators from price data"""
+    """Calculate technical indicators from price data (float64 close arrays)"""
     
     @staticmethod
-    def calculate_rsi(prices: List[float], period: int = 14) -> float:
-        """Calculate RSI indicator"""
-        if len(prices) < period + 1:
-            return 50.0
-        
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return round(rsi, 2)
+    def calculate_rsi(prices: np.ndarray, period: int = 14) -> float:
+        """Calculate RSI indicator (Wilder smoothing)"""
+        return round(indicators.rsi(indicators.as_closes(prices), period), 2)
     
     @staticmethod
-    def calculate_ema(prices: List[float], period: int) -> float:
+    def calculate_ema(prices: np.ndarray, period: int) -> float:
         """Calculate EMA"""
-        if len(prices) < period:
-            return prices[-1] if prices else 0
-        
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
-        for price in prices[1:]:
-            ema = (price - ema) * multiplier + ema
-        return round(ema, 2)
+        closes = indicators.as_closes(prices)
+        if closes.size < period:
+            return float(closes[-1]) if closes.size else 0
+        
+        return round(indicators.ema(closes, period), 2)
     
     @staticmethod
-    def calculate_macd(prices: List[float]) -> Dict[str, float]:
-        """Calculate MACD indicator"""
-        ema_12 = TechnicalAnalysis.calculate_ema(prices, 12)
-        ema_26 = TechnicalAnalysis.calculate_ema(prices, 26)
-        macd_line = ema_12 - ema_26
-        signal_line = TechnicalAnalysis.calculate_ema(prices[-9:], 9) if len(prices) >= 9 else macd_line
-        
+    def calculate_macd(
+        prices: np.ndarray,
+        fast: int = 12,
+        slow: int = 26,
+        signal: int = 9
+    ) -> Dict[str, float]:
+        """Calculate MACD indicator (fast/slow EMAs and signal EMA in one pass)"""
+        closes = indicators.as_closes(prices)
+        if not closes.size:
+            return {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
+        
+        macd_line, signal_line = indicators.macd(closes, fast, slow, signal)
         return {
             "macd": round(macd_line, 2),
             "signal": round(signal_line, 2),
             "histogram": round(macd_line - signal_line, 2)
         }
+    
+    @staticmethod
+    def calculate_bollinger(prices: np.ndarray, period: int = 20, num_std: float = 2.0) -> Dict[str, float]:
+        """Calculate Bollinger Bands over the last `period` closes"""
+        closes = indicators.as_closes(prices)
+        if not closes.size:
+            return {"middle": 0.0, "upper": 0.0, "lower": 0.0}
+        
+        middle, upper, lower = indicators.bollinger(closes, period, num_std)
+        return {"middle": round(middle, 2), "upper": round(upper, 2), "lower": round(lower, 2)}
+
+
+@dataclass(slots=True)
+class IndicatorStream:
+    """
+    Incremental RSI/EMA/MACD/Bollinger state for one symbol.
+    
+    Holds the indicator recurrences over closed candles only; push() advances
+    them by one candle in O(1), and snapshot() evaluates the indicators with
+    the still-forming candle as the latest close without committing it.
+    """
+    rsi_period: int = 14
+    last_ts: Any = None
+    last_close: Optional[float] = None
+    count: int = 0  # closed candles seen
+    ema: Dict[int, float] = field(default_factory=dict)  # period -> EMA
+    macd_signal: float = 0.0
+    avg_gain: float = 0.0  # Wilder RSI averages
+    avg_loss: float = 0.0
+    window: deque = field(default_factory=lambda: deque(maxlen=19))  # closes for Bollinger
+    
+    EMA_PERIODS = (12, 20, 26, 50)
+    BOLLINGER_PERIOD = 20
+    
+    def _step(self, close: float) -> Tuple[Dict[int, float], float, float, float]:
+        """EMAs, MACD signal and RSI averages after one more close"""
+        if self.count == 0:
+            return {period: close for period in self.EMA_PERIODS}, 0.0, 0.0, 0.0
+        
+        ema = {
+            period: value + (close - value) * indicators.ema_multiplier(period)
+            for period, value in self.ema.items()
+        }
+        macd = ema[12] - ema[26]
+        signal = self.macd_signal + (macd - self.macd_signal) * indicators.ema_multiplier(9)
+        avg_gain, avg_loss = indicators.wilder_step(
+            self.avg_gain, self.avg_loss, close - self.last_close, self.count, self.rsi_period
+        )
+        return ema, signal, avg_gain, avg_loss
+    
+    def push(self, ts: Any, close: float):
+        """Commit one closed candle"""
+        self.ema, self.macd_signal, self.avg_gain, self.avg_loss = self._step(close)
+        self.window.append(close)
+        self.last_ts = ts
+        self.last_close = close
+        self.count += 1
+    
+    def snapshot(self, close: float) -> Dict[str, Any]:
+        """Indicators with close as the latest price, matching TechnicalAnalysis on the same closes"""
+        ema, signal, avg_gain, avg_loss = self._step(close)
+        n = self.count + 1
+        
+        if n < self.rsi_period + 1:
+            rsi = 50.0
+        else:
+            rsi = 100.0 if avg_loss == 0 else round(100 - (100 / (1 + avg_gain / avg_loss)), 2)
+        
+        macd = ema[12] - ema[26]
+        middle, upper, lower = indicators.bollinger(
+            np.array([*self.window, close], dtype=np.float64), self.BOLLINGER_PERIOD, 2.0
+        )
+        return {
+            "rsi_14": rsi,
+            "ema_20": round(ema[20], 2) if n >= 20 else close,
+            "ema_50": round(ema[50], 2) if n >= 50 else close,
+            "macd": {
+                "macd": round(macd, 2),
+                "signal": round(signal, 2),
+                "histogram": round(macd - signal, 2)
+            },
+            "bollinger": {"middle": round(middle, 2), "upper": round(upper, 2), "lower": round(lower, 2)}
+        }
 
 
 class FenyrAgent:
@@ -73,26 +157,82 @@ class FenyrAgent:
         openai_api_key: str,
         weex_client: WeexClient,
         model: str = "gpt-5.2",
-        max_position_size: float = 0.0002
+        max_position_size: float = 0.0002,
+        max_tool_rounds: int = 2,
+        openai_client: Optional["OpenAI"] = None,
+        prefetch: bool = True
     ):
-        self.openai = OpenAI(api_key=openai_api_key)
+        # Share one pooled HTTP/2 client when the caller has one. The OpenAI
+        # SDK is only imported when we have to build a client ourselves
+        if openai_client is None:
+            from agents import create_openai_client
+            openai_client = create_openai_client(openai_api_key)
+        self.openai = openai_client
         self.weex = weex_client
         self.model = model
         self.max_position_size = max_position_size
-        self.conversation_history = []
+        self.conversation_history: deque = deque(maxlen=20)  # last 20 messages
         self.trade_count = 0
         
+        # Tool rounds per turn (data, then trade) before a final answer is forced
+        self.max_tool_rounds = max_tool_rounds
+        
+        # Fetch the usual data tools up front and put the results in the
+        # prompt, so GPT can usually go straight to a decision
+        self.prefetch = prefetch
+        
+        # Worker pool for fanning out read-only tool calls
+        self._tool_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fenyr-tool")
+        
+        # Per-turn cache of WEEX reads: (kind, symbol) -> (fetched_at, value)
+        self._req_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        
+        # Streaming indicator state per symbol, carried across turns
+        self._ind_state: Dict[str, IndicatorStream] = {}
+        self._ind_lock = threading.Lock()
+        
+        # Separate pool for the WEEX requests inside a single tool, so a tool
+        # running on _tool_pool never waits on a slot in its own pool
+        self._fetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fenyr-fetch")
+    
+    def _cached(self, kind: str, symbol: str, ttl: float) -> Any:
+        """
+        Call weex.get_<kind>(symbol), reusing a result younger than ttl seconds.
+        Pass symbol="" for account-level endpoints.
+        """
+        key = (kind, symbol)
+        now = time.monotonic()
+        hit = self._req_cache.get(key)
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+        
+        fetch = getattr(self.weex, f"get_{kind}")
+        value = fetch(symbol) if symbol else fetch()
+        self._req_cache[key] = (now, value)
+        return value
+    
+    def _cached_pair(self, first: Tuple[str, str, float], second: Tuple[str, str, float]) -> Tuple[Any, Any]:
+        """Run two independent _cached reads concurrently, each as (kind, symbol, ttl)"""
+        pending = self._fetch_pool.submit(self._cached, *second)
+        return self._cached(*first), pending.result()
+    
     def _add_message(self, role: str, content: str):
         """Add message to conversation history"""
         self.conversation_history.append({"role": role, "content": content})
-        # Keep last 20 messages
-        if len(self.conversation_history) > 20:
-            self.conversation_history = self.conversation_history[-20:]
+    
+    def _build_messages(self) -> List[Dict]:
+        """System prompt followed by the history"""
+        history = list(self.conversation_history)
+        # The bounded history can evict an assistant tool_calls message while
+        # keeping its tool results; the API rejects such orphaned results
+        start = 0
+        while start < len(history) and history[start]["role"] == "tool":
+            start += 1
+        return [*_SYSTEM_MSG, *history[start:]]
     
     def _get_market_data(self, symbol: str) -> Dict:
         """Fetch market data for analysis"""
-        ticker = self.weex.get_ticker(symbol)
-        depth = self.weex.get_depth(symbol)
+        ticker, depth = self._cached_pair(("ticker", symbol, 2), ("depth", symbol, 1))
         
         return {
             "symbol": symbol,
@@ -106,41 +246,87 @@ class FenyrAgent:
             "timestamp": datetime.utcnow().isoformat()
         }
     
+    def _candle_closes(self, symbol: str, limit: int, ttl: float = 60) -> List[Tuple[int, float]]:
+        """
+        (timestamp, close) pairs for the latest candles, oldest first.
+        
+        The window goes into the per-turn request cache, so a later call this
+        turn (e.g. the indicator tool after the prefetch) takes the tail of
+        the window already fetched instead of asking WEEX again. Hourly
+        candles barely move within a turn; the ticker carries the live price.
+        """
+        key = ("candles", symbol)
+        now = time.monotonic()
+        hit = self._req_cache.get(key)
+        if hit and now - hit[0] < ttl and len(hit[1]) >= limit:
+            return hit[1][-limit:]
+        
+        candles = self.weex.get_candles_np(symbol, "1h", limit)
+        closes = list(zip(candles["ts"].tolist(), candles["close"].tolist()))
+        self._req_cache[key] = (now, closes)
+        return closes
+    
+    def _advance_indicators(self, symbol: str) -> Tuple[Optional[IndicatorStream], Any]:
+        """
+        Bring the symbol's IndicatorStream up to date and return it with the
+        forming candle's close (or None and an error message).
+        
+        Normally only the last 3 candles are fetched: if the stream's last
+        closed candle is among them, any newer closed candle is pushed in
+        O(1). On the first run or after a gap the stream is warmed up from
+        the full 50-candle window.
+        """
+        state = self._ind_state.get(symbol)
+        if state is not None:
+            recent = self._candle_closes(symbol, 3)
+            timestamps = [ts for ts, _ in recent[:-1]]
+            if state.last_ts in timestamps:
+                for ts, close in recent[timestamps.index(state.last_ts) + 1:-1]:
+                    state.push(ts, close)
+                return state, recent[-1][1]
+        
+        parsed = self._candle_closes(symbol, 50)
+        if not parsed:
+            return None, "Could not fetch candle data"
+        
+        state = IndicatorStream()
+        for ts, close in parsed[:-1]:
+            state.push(ts, close)
+        self._ind_state[symbol] = state
+        return state, parsed[-1][1]
+    
     def _get_technical_indicators(self, symbol: str, indicators: List[str]) -> Dict:
         """Calculate technical indicators"""
-        candles = self.weex.get_candles(symbol, "1h", 50)
-        
-        if not candles or not isinstance(candles, list):
-            return {"error": "Could not fetch candle data"}
-        
-        # Extract close prices
-        closes = [float(c[4]) for c in candles if isinstance(c, list) and len(c) > 4]
-        
-        if not closes:
-            return {"error": "No price data available"}
+        with self._ind_lock:
+            state, latest = self._advance_indicators(symbol)
+            if state is None:
+                return {"error": latest}
+            values = state.snapshot(latest)
         
         result = {"symbol": symbol}
         
         if "rsi" in indicators:
-            result["rsi_14"] = TechnicalAnalysis.calculate_rsi(closes)
+            result["rsi_14"] = values["rsi_14"]
         
         if "ema_20" in indicators:
-            result["ema_20"] = TechnicalAnalysis.calculate_ema(closes, 20)
+            result["ema_20"] = values["ema_20"]
         
         if "ema_50" in indicators:
-            result["ema_50"] = TechnicalAnalysis.calculate_ema(closes, 50)
+            result["ema_50"] = values["ema_50"]
         
         if "macd" in indicators:
-            result["macd"] = TechnicalAnalysis.calculate_macd(closes)
+            result["macd"] = values["macd"]
+        
+        if "bollinger" in indicators:
+            result["bollinger"] = values["bollinger"]
         
-        result["current_price"] = closes[-1] if closes else 0
+        result["current_price"] = latest
         
         return result
-    
+
     def _get_account_status(self) -> Dict:
         """Get account balance and positions"""
-        assets = self.weex.get_assets()
-        positions = self.weex.get_positions()
+        assets, positions = self._cached_pair(("assets", "", 5), ("positions", "", 5))
         
         usdt_asset = next((a for a in assets if a.get("coinName") == "USDT"), {})
         
@@ -169,9 +355,17 @@ class FenyrAgent:
         action: str,
         size: str,
         confidence: float,
-        reasoning: str
+        reasoning: str,
+        market_price: Optional[float] = None
     ) -> Dict:
-        """Execute a trade and upload AI log"""
+        """
+        Execute a trade and upload AI log.
+        
+        market_price is the price GPT saw this turn. It is only a sanity
+        check: if it is 1% or more away from the ticker, the trade is rejected.
+        The log and the order always use the ticker price - the one already
+        fetched this turn, or a fresh ticker when there is no usable one.
+        """
         
         # Validate confidence
         if confidence < 0.6:
@@ -182,9 +376,20 @@ class FenyrAgent:
         if size_float > self.max_position_size:
             return {"error": f"Size exceeds max of {self.max_position_size}", "executed": False}
         
-        # Get current price for reference
-        ticker = self.weex.get_ticker(symbol)
-        current_price = float(ticker.get("last", 0))
+        # Confirmed ticker price: this turn's if usable, else a fresh read
+        seen = self._req_cache.get(("ticker", symbol))
+        current_price = float(seen[1].get("last") or 0) if seen else 0.0
+        if current_price <= 0:
+            ticker = self._cached("ticker", symbol, ttl=0)
+            current_price = float(ticker.get("last") or 0)
+        if current_price <= 0:
+            return {"error": f"No usable ticker price for {symbol}", "executed": False}
+        
+        if market_price is not None and abs(float(market_price) - current_price) / current_price >= 0.01:
+            return {
+                "error": f"market_price {market_price} is more than 1% away from ticker price {current_price}",
+                "executed": False
+            }
         
         # Map action to side
         side = ACTION_TO_SIDE.get(action)
@@ -197,7 +402,7 @@ class FenyrAgent:
             size=size,
             side=side,
             order_type=1,  # Market order
-            client_oid=f"fenyr_{int(time.time() * 1000)}"
+            client_oid=f"fenyr_{time.time_ns() // 1_000_000}"
         )
         
         order_id = order_result.get("order_id")
@@ -238,13 +443,35 @@ class FenyrAgent:
     
     def _get_funding_rate(self, symbol: str) -> Dict:
         """Get funding rate info"""
-        funding = self.weex.get_funding_rate(symbol)
+        funding = self._cached("funding_rate", symbol, ttl=30)
         return {
             "symbol": symbol,
             "funding_rate": funding.get("fundingRate"),
             "next_funding_time": funding.get("fundingTime")
         }
     
+    def _prefetch_snapshot(self, symbol: str) -> Dict[str, Any]:
+        """
+        Every read-only tool result for symbol, fetched concurrently. The
+        reads land in the per-turn request cache, so a tool call for the
+        same data later in the turn costs nothing.
+        """
+        pending = {
+            "market_data": self._tool_pool.submit(self._get_market_data, symbol),
+            "technical_indicators": self._tool_pool.submit(
+                self._get_technical_indicators, symbol, ["rsi", "ema_20", "ema_50", "macd", "bollinger"]
+            ),
+            "account_status": self._tool_pool.submit(self._get_account_status),
+            "funding_rate": self._tool_pool.submit(self._get_funding_rate, symbol)
+        }
+        snapshot = {}
+        for name, future in pending.items():
+            try:
+                snapshot[name] = future.result()
+            except Exception as e:
+                snapshot[name] = {"error": str(e)}
+        return snapshot
+    
     def _process_tool_call(self, tool_name: str, arguments: Dict) -> str:
         """Process a tool call from GPT"""
         
@@ -263,7 +490,8 @@ class FenyrAgent:
                 arguments["action"],
                 arguments["size"],
                 arguments["confidence"],
-                arguments["reasoning"]
+                arguments["reasoning"],
+                arguments.get("market_price")
             )
         elif tool_name == "get_funding_rate":
             result = self._get_funding_rate(arguments["symbol"])
@@ -272,10 +500,90 @@ class FenyrAgent:
         else:
             result = {"error": f"Unknown tool: {tool_name}"}
         
-        return json.dumps(result, indent=2)
+        return orjson.dumps(result, default=str).decode()
+    
+    @staticmethod
+    def _arguments_complete(arguments: str) -> bool:
+        """True once a streamed tool-call arguments string is a full JSON document"""
+        try:
+            orjson.loads(arguments)
+            return True
+        except orjson.JSONDecodeError:
+            return False
+    
+    def _chat(
+        self,
+        messages: List[Dict],
+        tool_choice: str = "auto",
+        on_tool_call: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Run one streamed chat completion and return the assistant message.
+        
+        on_tool_call is invoked once per tool call, in order, as soon as that
+        call's arguments have fully arrived - usually well before GPT finishes
+        writing - so tool execution overlaps with decoding.
+        
+        Completions are never cached locally: a replayed execute_trade
+        would place an order on a stale decision. The system prompt must
+        stay first and byte-identical so OpenAI's server-side prompt cache
+        applies instead.
+        """
+        stream = self.openai.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            tools=TRADING_TOOLS,
+            tool_choice=tool_choice,
+            parallel_tool_calls=True,
+            stream=True
+        )
+        
+        content: List[str] = []
+        partial: Dict[int, Dict[str, str]] = {}  # index -> id/name/arguments so far
+        tool_calls: List[SimpleNamespace] = []  # completed, in index order
+        
+        def emit_ready(final: bool = False):
+            # Calls complete strictly in order so writes keep GPT's ordering
+            while len(tool_calls) in partial:
+                call = partial[len(tool_calls)]
+                if not final and not self._arguments_complete(call["arguments"]):
+                    break
+                tool_call = SimpleNamespace(
+                    id=call["id"],
+                    type="function",
+                    function=SimpleNamespace(name=call["name"], arguments=call["arguments"])
+                )
+                tool_calls.append(tool_call)
+                if on_tool_call:
+                    on_tool_call(tool_call)
+        
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content.append(delta.content)
+            for tc in delta.tool_calls or ():
+                call = partial.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function:
+                    call["name"] += tc.function.name or ""
+                    call["arguments"] += tc.function.arguments or ""
+            if delta.tool_calls:
+                emit_ready()
+        emit_ready(final=True)
+        
+        return SimpleNamespace(content="".join(content) or None, tool_calls=tool_calls or None)
     
-    def analyze_and_trade(self, user_prompt: str = None) -> str:
-        """Main agent loop - analyze market and potentially trade"""
+    def analyze_and_trade(self, user_prompt: str = None, symbol: str = "cmt_btcusdt") -> str:
+        """
+        Main agent loop - analyze market and potentially trade.
+        
+        With prefetch on, symbol's market data, indicators, account status
+        and funding rate are attached to the prompt, which saves GPT the
+        data round trip; the data tools remain for anything else.
+        """
         
         # Default prompt if none provided
         if not user_prompt:
@@ -289,24 +597,44 @@ class FenyrAgent:
             
             Provide detailed reasoning for your decision."""
         
+        # Fresh market data for every turn
+        self._req_cache.clear()
+        self.weex.new_cycle()
+        
+        if self.prefetch:
+            snapshot = orjson.dumps(self._prefetch_snapshot(symbol), default=str).decode()
+            user_prompt = (
+                f"{user_prompt}\n\nMarket snapshot for {symbol}, fetched just now "
+                f"(only call data tools for anything not in it):\n{snapshot}"
+            )
+        
         self._add_message("user", user_prompt)
         
-        messages = [
-            {"role": "system", "content": TRADING_SYSTEM_PROMPT}
-        ] + self.conversation_history
+        # Tool calls of the message being streamed: (tool_call, name, arguments, future)
+        dispatched: List[Tuple[Any, str, Dict, Optional[Future]]] = []
         
-        # Initial GPT call
-        response = self.openai.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=TRADING_TOOLS,
-            tool_choice="auto"
-        )
+        def dispatch(tool_call):
+            tool_name = tool_call.function.name
+            arguments = orjson.loads(tool_call.function.arguments)
+            logger.info("🔧 Calling tool: %s", tool_name)
+            logger.debug("   Arguments: %s", arguments)
+            
+            # Reads start immediately, in parallel. An order, and everything
+            # GPT asked for after it, runs one at a time once the stream ends
+            if tool_name in WRITE_TOOLS or any(future is None for *_, future in dispatched):
+                future = None
+            else:
+                future = self._tool_pool.submit(self._process_tool_call, tool_name, arguments)
+            dispatched.append((tool_call, tool_name, arguments, future))
         
-        assistant_message = response.choices[0].message
+        # Initial GPT call
+        assistant_message = self._chat(self._build_messages(), on_tool_call=dispatch)
         
         # Process tool calls if any
+        rounds = 0
         while assistant_message.tool_calls:
+            rounds += 1
+            wrote = any(tc.function.name in WRITE_TOOLS for tc in assistant_message.tool_calls)
             # Add assistant message with tool calls
             self.conversation_history.append({
                 "role": "assistant",
@@ -324,17 +652,11 @@ class FenyrAgent:
                 ]
             })
             
-            # Process each tool call
-            for tool_call in assistant_message.tool_calls:
-                tool_name = tool_call.function.name
-                arguments = json.loads(tool_call.function.arguments)
-                
-                print(f"🔧 Calling tool: {tool_name}")
-                print(f"   Arguments: {arguments}")
-                
-                result = self._process_tool_call(tool_name, arguments)
-                
-                print(f"   Result: {result[:200]}...")
+            # Collect results in call order; deferred calls run here, serially
+            for tool_call, tool_name, arguments, future in dispatched:
+                result = future.result() if future else self._process_tool_call(tool_name, arguments)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("   Result (%s): %s...", tool_name, result[:200])
                 
                 # Add tool result
                 self.conversation_history.append({
@@ -342,20 +664,12 @@ class FenyrAgent:
                     "tool_call_id": tool_call.id,
                     "content": result
                 })
+            dispatched.clear()
             
-            # Continue conversation with tool results
-            messages = [
-                {"role": "system", "content": TRADING_SYSTEM_PROMPT}
-            ] + self.conversation_history
-            
-            response = self.openai.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=TRADING_TOOLS,
-                tool_choice="auto"
-            )
-            
-            assistant_message = response.choices[0].message
+            # Continue conversation with tool results. Once an order has gone
+            # out, or the round budget is spent, only a final answer is allowed
+            tool_choice = "none" if wrote or rounds >= self.max_tool_rounds else "auto"
+            assistant_message = self._chat(self._build_messages(), tool_choice, on_tool_call=dispatch)
         
         # Final response
         final_response = assistant_message.content or "Analysis complete."
@@ -365,21 +679,26 @@ class FenyrAgent:
     
     def run_continuous(self, interval_seconds: int = 300):
         """Run agent continuously at specified interval"""
-        print(f"🚀 Starting Fenyr Trading Agent")
-        print(f"   Model: {self.model}")
-        print(f"   Max Position: {self.max_position_size} BTC")
-        print(f"   Interval: {interval_seconds}s")
-        print("-" * 50)
-        
+        logger.info("🚀 Starting Fenyr Trading Agent")
+        logger.info("   Model: %s", self.model)
+        logger.info("   Max Position: %s BTC", self.max_position_size)
+        logger.info("   Interval: %ss", interval_seconds)
+        logger.info("-" * 50)
+        
+        # Fixed monotonic cadence: analysis time does not delay later cycles,
+        # and an overrun starts the next cycle straight away
+        deadline = time.monotonic()
         while True:
             try:
-                print(f"\n⏰ {datetime.utcnow().isoformat()} - Running analysis...")
+                logger.info("\n⏰ %s - Running analysis...", datetime.utcnow().isoformat())
                 result = self.analyze_and_trade()
-                print(f"\n📊 Analysis Result:\n{result}")
-                print(f"\n📈 Total trades executed: {self.trade_count}")
+                logger.info("\n📊 Analysis Result:\n%s", result)
+                logger.info("\n📈 Total trades executed: %s", self.trade_count)
                 
             except Exception as e:
-                print(f"❌ Error: {e}")
+                logger.error("❌ Error: %s", e)
             
-            print(f"\n💤 Sleeping for {interval_seconds}s...")
-            time.sleep(interval_seconds)
+            deadline = max(deadline + interval_seconds, time.monotonic())
+            wait = max(0.0, deadline - time.monotonic())
+            logger.info("\n💤 Sleeping for %.1fs...", wait)
+            time.sleep(wait)
@@ -9,6 +9,7 @@ WEEX_API_KEY = "weex_YOUR_KEY_HERE"
 WEEX_SECRET_KEY = "YOUR_SECRET_HERE"
 WEEX_PASSPHRASE = "YOUR_PASSPHRASE_HERE"
 WEEX_BASE_URL = "https://api-contract.weex.com"
+WEEX_WS_URL = "wss://ws-contract.weex.com/v3/ws/public"  # market-data stream (--stream)
 
 # Trading Parameters
 MAX_POSITION_SIZE_BTC = 0.001  # Maximum position size in BTC
@@ -0,0 +1,103 @@
+"""
+Technical Indicators for Fenyr Trading Agent
+RSI, EMA, MACD and Bollinger kernels over float64 close arrays
+"""
+
+from typing import Tuple
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional - the kernels run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# EMA smoothing factors 2 / (period + 1) for the periods used by the agents
+EMA_MULTIPLIERS = {period: 2.0 / (period + 1) for period in (9, 12, 20, 26, 50)}
+
+
+def ema_multiplier(period: int) -> float:
+    return EMA_MULTIPLIERS.get(period) or 2.0 / (period + 1)
+
+
+def as_closes(prices) -> np.ndarray:
+    """View prices as a C-contiguous float64 array (no copy when it already is one)"""
+    return np.ascontiguousarray(prices, dtype=np.float64)
+
+
+@njit(cache=True, fastmath=True)
+def wilder_step(avg_gain: float, avg_loss: float, delta: float, n: int, period: int) -> Tuple[float, float]:
+    """Fold the n-th (1-based) price delta into Wilder's RSI averages"""
+    gain = delta if delta > 0 else 0.0
+    loss = -delta if delta < 0 else 0.0
+    if n <= period:
+        return avg_gain + gain / period, avg_loss + loss / period
+    return (avg_gain * (period - 1) + gain) / period, (avg_loss * (period - 1) + loss) / period
+
+
+@njit(cache=True, fastmath=True)
+def rsi(close: np.ndarray, period: int = 14) -> float:
+    """
+    Wilder RSI of the last close: averages seeded with the mean of the first
+    `period` gains/losses, then smoothed. 50.0 with too little data.
+    """
+    if close.size < period + 1:
+        return 50.0
+    
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, close.size):
+        avg_gain, avg_loss = wilder_step(avg_gain, avg_loss, close[i] - close[i - 1], i, period)
+    
+    if avg_loss == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, fastmath=True)
+def ema(close: np.ndarray, period: int) -> float:
+    """Last value of the EMA seeded with the first close"""
+    alpha = 2.0 / (period + 1)
+    value = close[0]
+    for i in range(1, close.size):
+        value += (close[i] - value) * alpha
+    return value
+
+
+@njit(cache=True, fastmath=True)
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[float, float]:
+    """MACD line and its signal EMA, both EMAs and the signal in one pass"""
+    k_fast = 2.0 / (fast + 1)
+    k_slow = 2.0 / (slow + 1)
+    k_signal = 2.0 / (signal + 1)
+    
+    ema_fast = close[0]
+    ema_slow = close[0]
+    signal_line = 0.0  # MACD of the seed price is 0
+    for i in range(1, close.size):
+        ema_fast += (close[i] - ema_fast) * k_fast
+        ema_slow += (close[i] - ema_slow) * k_slow
+        signal_line += (ema_fast - ema_slow - signal_line) * k_signal
+    return ema_fast - ema_slow, signal_line
+
+
+@njit(cache=True, fastmath=True)
+def bollinger(close: np.ndarray, period: int = 20, num_std: float = 2.0) -> Tuple[float, float, float]:
+    """Middle (SMA), upper and lower band over the last `period` closes"""
+    n = min(period, close.size)
+    window = close[close.size - n:]
+    
+    mean = 0.0
+    for i in range(n):
+        mean += window[i]
+    mean /= n
+    
+    var = 0.0
+    for i in range(n):
+        var += (window[i] - mean) ** 2
+    std = (var / n) ** 0.5
+    
+    return mean, mean + num_std * std, mean - num_std * std
@@ -6,16 +6,19 @@ GPT-5.2 powered autonomous trading bot for WEEX AI Wars
 
 import sys
 import argparse
+import logging
 from datetime import datetime
 
-import config
-from weex_client import create_client
+from weex_client import create_client, WeexWSClient, WS_URL
 from ai_trader import FenyrAgent
+from agents import configure_logging, create_openai_client, validate_config
+
+logger = logging.getLogger(__name__)
 
 
 def print_banner():
     """Print startup banner"""
-    print("""
+    logger.info("""
 ╔═══════════════════════════════════════════════════════════╗
 ║                                                           ║
 ║   ███████╗███████╗███╗   ██╗██╗   ██╗██████╗             ║
@@ -45,53 +48,53 @@ def run_single_analysis(agent: FenyrAgent, symbol: str = "cmt_btcusdt"):
     Provide detailed analysis and reasoning for your decision.
     Remember: This is for the WEEX AI Wars competition - all trades must be well-reasoned."""
     
-    print(f"\n🔍 Analyzing {symbol}...")
-    print("-" * 50)
+    logger.info("\n🔍 Analyzing %s...", symbol)
+    logger.info("-" * 50)
     
-    result = agent.analyze_and_trade(prompt)
+    result = agent.analyze_and_trade(prompt, symbol)
     
-    print(f"\n📊 Analysis Result:")
-    print("-" * 50)
-    print(result)
+    logger.info("\n📊 Analysis Result:")
+    logger.info("-" * 50)
+    logger.info("%s", result)
     
     return result
 
 
 def run_demo(agent: FenyrAgent):
     """Run a demo showing agent capabilities"""
-    print("\n🎯 Running Demo - Testing Agent Capabilities\n")
+    logger.info("\n🎯 Running Demo - Testing Agent Capabilities\n")
     
     # Test 1: Market Data
-    print("=" * 60)
-    print("TEST 1: Fetching Market Data")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("TEST 1: Fetching Market Data")
+    logger.info("=" * 60)
     result = agent.analyze_and_trade(
         "Get the current market data for cmt_btcusdt and summarize the key metrics."
     )
-    print(result)
+    logger.info("%s", result)
     
     # Test 2: Technical Analysis
-    print("\n" + "=" * 60)
-    print("TEST 2: Technical Analysis")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("TEST 2: Technical Analysis")
+    logger.info("=" * 60)
     result = agent.analyze_and_trade(
         "Calculate RSI, EMA_20, EMA_50, and MACD for cmt_btcusdt. What do these indicators suggest?"
     )
-    print(result)
+    logger.info("%s", result)
     
     # Test 3: Account Status
-    print("\n" + "=" * 60)
-    print("TEST 3: Account Status")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("TEST 3: Account Status")
+    logger.info("=" * 60)
     result = agent.analyze_and_trade(
         "Check our account status. How much USDT do we have available? Any open positions?"
     )
-    print(result)
+    logger.info("%s", result)
     
     # Test 4: Full Analysis & Trade Decision
-    print("\n" + "=" * 60)
-    print("TEST 4: Full Analysis & Trade Decision")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("TEST 4: Full Analysis & Trade Decision")
+    logger.info("=" * 60)
     result = agent.analyze_and_trade(
         """Perform a complete analysis of cmt_btcusdt:
         1. Get current price and orderbook
@@ -100,11 +103,11 @@ def run_demo(agent: FenyrAgent):
         4. Make a trading decision with full reasoning
         5. If confident (>0.7), execute a small trade (0.0002 BTC)"""
     )
-    print(result)
+    logger.info("%s", result)
     
-    print("\n" + "=" * 60)
-    print(f"DEMO COMPLETE - Trades executed: {agent.trade_count}")
-    print("=" * 60)
+    logger.info("\n" + "=" * 60)
+    logger.info("DEMO COMPLETE - Trades executed: %s", agent.trade_count)
+    logger.info("=" * 60)
 
 
 def main():
@@ -114,42 +117,56 @@ def main():
     parser.add_argument("--symbol", default="cmt_btcusdt", help="Trading symbol")
     parser.add_argument("--interval", type=int, default=300, 
                        help="Interval in seconds for continuous mode")
+    parser.add_argument("--verbose", action="store_true",
+                       help="Also log tool arguments and results")
+    parser.add_argument("--stream", action="store_true",
+                       help="Read ticker/depth/candles from the WEEX WebSocket feed (REST fallback)")
     
     args = parser.parse_args()
     
+    # Fail before any network work if the config is incomplete
+    config = validate_config()
+    
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO)
+    
     print_banner()
     
-    print(f"📅 Started: {datetime.utcnow().isoformat()}")
-    print(f"🤖 Model: {config.GPT_MODEL}")
-    print(f"📊 Symbol: {args.symbol}")
-    print(f"🔄 Mode: {args.mode}")
+    logger.info("📅 Started: %s", datetime.utcnow().isoformat())
+    logger.info("🤖 Model: %s", config.GPT_MODEL)
+    logger.info("📊 Symbol: %s", args.symbol)
+    logger.info("🔄 Mode: %s", args.mode)
     
     # Initialize WEEX client
-    print("\n🔗 Connecting to WEEX Exchange...")
+    logger.info("\n🔗 Connecting to WEEX Exchange...")
     weex_client = create_client(
         api_key=config.WEEX_API_KEY,
         secret_key=config.WEEX_SECRET_KEY,
         passphrase=config.WEEX_PASSPHRASE,
         base_url=config.WEEX_BASE_URL
     )
+    if args.stream:
+        weex_client.attach_stream(
+            WeexWSClient([args.symbol], getattr(config, "WEEX_WS_URL", WS_URL)).start()
+        )
     
     # Test connection
     try:
         ticker = weex_client.get_ticker(args.symbol)
-        print(f"✅ Connected! {args.symbol} = ${ticker.get('last')}")
+        logger.info("✅ Connected! %s = $%s", args.symbol, ticker.get('last'))
     except Exception as e:
-        print(f"❌ Connection failed: {e}")
+        logger.error("❌ Connection failed: %s", e)
         sys.exit(1)
     
     # Initialize AI agent
-    print("\n🧠 Initializing AI Agent...")
+    logger.info("\n🧠 Initializing AI Agent...")
     agent = FenyrAgent(
         openai_api_key=config.OPENAI_API_KEY,
         weex_client=weex_client,
         model=config.GPT_MODEL,
-        max_position_size=config.MAX_POSITION_SIZE_BTC
+        max_position_size=config.MAX_POSITION_SIZE_BTC,
+        openai_client=create_openai_client(config.OPENAI_API_KEY)
     )
-    print("✅ Agent ready!")
+    logger.info("✅ Agent ready!")
     
     # Run based on mode
     if args.mode == "demo":
@@ -159,8 +176,8 @@ def main():
     else:
         run_single_analysis(agent, args.symbol)
     
-    print(f"\n📈 Total trades executed: {agent.trade_count}")
-    print("🏁 Fenyr Agent finished.")
+    logger.info("\n📈 Total trades executed: %s", agent.trade_count)
+    logger.info("🏁 Fenyr Agent finished.")
 
 
 if __name__ == "__main__":
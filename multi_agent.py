@@ -4,19 +4,23 @@ Fenyr Multi-Agent Trading System
 Team of AI agents collaborating with real conversations
 """
 
-import sys
 import argparse
+import asyncio
+import logging
 import time
 from datetime import datetime
-from openai import OpenAI
+from typing import Optional
 
-import config
-from weex_client import create_client
-from agents import CoordinatorAgent, Signal, Action
+from weex_client import create_client, AsyncWeexClient, WeexWSClient, WS_URL
+from agents import (
+    CoordinatorAgent, Action, BatchLogger, configure_logging, create_openai_client, validate_config
+)
+
+logger = logging.getLogger(__name__)
 
 
 def print_banner():
-    print("""
+    logger.info("""
 ╔═══════════════════════════════════════════════════════════════╗
 ║                                                               ║
 ║   ███████╗███████╗███╗   ██╗██╗   ██╗██████╗                 ║
@@ -33,88 +37,129 @@ def print_banner():
     """)
 
 
-def run_single_team_analysis(coordinator: CoordinatorAgent, symbol: str):
+def next_deadline(deadline: float, interval: float) -> float:
+    """
+    Monotonic start time of the next cycle. A cycle that overran its slot
+    starts the next one immediately instead of bursting to catch up.
+    """
+    return max(deadline + interval, time.monotonic())
+
+
+def analyze_tick(coordinator: CoordinatorAgent, symbol: str,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+    """One team analysis; on the run's event loop when --async is on"""
+    if loop is None:
+        return coordinator.run_team_analysis(symbol)
+    return loop.run_until_complete(coordinator.arun_team_analysis(symbol))
+
+
+def run_single_team_analysis(coordinator: CoordinatorAgent, symbol: str,
+                             loop: Optional[asyncio.AbstractEventLoop] = None):
     """Run single team analysis cycle"""
-    print(f"\n⏰ {datetime.utcnow().isoformat()} - Starting team analysis")
+    logger.info("\n⏰ %s - Starting team analysis", datetime.utcnow().isoformat())
     
-    team_decision = coordinator.run_team_analysis(symbol)
+    team_decision = analyze_tick(coordinator, symbol, loop)
     
-    print(f"\n📋 TEAM DECISION SUMMARY:")
-    print(f"   Action: {team_decision.action.value.upper()}")
-    print(f"   Direction: {team_decision.trade_direction}")
-    print(f"   Size: {team_decision.size}")
-    print(f"   Confidence: {team_decision.confidence:.2f}")
-    print(f"   AI Logs Uploaded: {len(team_decision.agent_decisions)}")
+    logger.info("\n📋 TEAM DECISION SUMMARY:")
+    logger.info("   Action: %s", team_decision.action.value.upper())
+    logger.info("   Direction: %s", team_decision.trade_direction)
+    logger.info("   Size: %s", team_decision.size)
+    logger.info("   Confidence: %.2f", team_decision.confidence)
+    logger.info("   AI Logs Queued: %s", len(team_decision.agent_decisions))
     
     return team_decision
 
 
-def run_hft_mode(coordinator: CoordinatorAgent, symbol: str, cycles: int = 10, interval: float = 30):
+def run_hft_mode(coordinator: CoordinatorAgent, symbol: str, cycles: int = 10, interval: float = 30,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
     """
     High-Frequency Trading Mode
     Runs rapid analysis cycles with quick decisions
     """
-    print(f"\n🚀 HFT MODE ACTIVATED")
-    print(f"   Symbol: {symbol}")
-    print(f"   Cycles: {cycles}")
-    print(f"   Interval: {interval}s")
-    print("-" * 60)
+    logger.info("\n🚀 HFT MODE ACTIVATED")
+    logger.info("   Symbol: %s", symbol)
+    logger.info("   Cycles: %s", cycles)
+    logger.info("   Interval: %ss", interval)
+    logger.info("-" * 60)
     
     trades_executed = 0
     total_ai_logs = 0
     
+    # Cycles start on a fixed monotonic cadence, so analysis time does not
+    # push every later cycle back
+    deadline = time.monotonic()
+    
     for cycle in range(1, cycles + 1):
-        print(f"\n{'='*60}")
-        print(f"🔄 HFT CYCLE {cycle}/{cycles}")
-        print(f"{'='*60}")
+        logger.info("\n" + "=" * 60)
+        logger.info("🔄 HFT CYCLE %s/%s", cycle, cycles)
+        logger.info("=" * 60)
         
         try:
-            team_decision = coordinator.run_team_analysis(symbol)
+            team_decision = analyze_tick(coordinator, symbol, loop)
             
             total_ai_logs += len(team_decision.agent_decisions)
             
             if team_decision.action == Action.EXECUTE:
                 trades_executed += 1
-                print(f"⚡ TRADE EXECUTED: {team_decision.trade_direction} {team_decision.size}")
+                logger.info("⚡ TRADE EXECUTED: %s %s", team_decision.trade_direction, team_decision.size)
             elif team_decision.action == Action.ALERT:
-                print(f"🔔 ALERT: Market conditions notable but not actionable")
+                logger.info("🔔 ALERT: Market conditions notable but not actionable")
             else:
-                print(f"⏸️ HOLD: Waiting for better opportunity")
+                logger.info("⏸️ HOLD: Waiting for better opportunity")
             
         except Exception as e:
-            print(f"❌ Cycle error: {e}")
+            logger.error("❌ Cycle error: %s", e)
         
         if cycle < cycles:
-            print(f"\n💤 Next cycle in {interval}s...")
-            time.sleep(interval)
+            deadline = next_deadline(deadline, interval)
+            wait = max(0.0, deadline - time.monotonic())
+            logger.info("\n💤 Next cycle in %.1fs...", wait)
+            time.sleep(wait)
     
-    print(f"\n{'='*60}")
-    print(f"🏁 HFT SESSION COMPLETE")
-    print(f"{'='*60}")
-    print(f"   Cycles: {cycles}")
-    print(f"   Trades Executed: {trades_executed}")
-    print(f"   AI Logs Uploaded: {total_ai_logs}")
+    logger.info("\n" + "=" * 60)
+    logger.info("🏁 HFT SESSION COMPLETE")
+    logger.info("=" * 60)
+    logger.info("   Cycles: %s", cycles)
+    logger.info("   Trades Executed: %s", trades_executed)
+    logger.info("   AI Logs Queued: %s", total_ai_logs)
 
 
-def run_continuous_team(coordinator: CoordinatorAgent, symbol: str, interval: int = 300):
-    """Run continuous team analysis"""
-    print(f"\n🔄 CONTINUOUS TEAM MODE")
-    print(f"   Interval: {interval}s")
+def run_continuous_team(coordinator: CoordinatorAgent, symbol: str, interval: int = 300,
+                        audit: Optional[BatchLogger] = None,
+                        loop: Optional[asyncio.AbstractEventLoop] = None):
+    """
+    Run continuous team analysis.
+    
+    With an audit BatchLogger, each cycle also queues a retrospective
+    rationale for the Batch API instead of spending realtime quota on it;
+    whatever is queued is submitted, and finished batches collected, on exit.
+    """
+    logger.info("\n🔄 CONTINUOUS TEAM MODE")
+    logger.info("   Interval: %ss", interval)
     
     cycle = 0
-    while True:
-        cycle += 1
-        print(f"\n{'='*60}")
-        print(f"CYCLE {cycle}")
-        print(f"{'='*60}")
-        
-        try:
-            run_single_team_analysis(coordinator, symbol)
-        except Exception as e:
-            print(f"❌ Error: {e}")
-        
-        print(f"\n💤 Next analysis in {interval}s...")
-        time.sleep(interval)
+    deadline = time.monotonic()
+    try:
+        while True:
+            cycle += 1
+            logger.info("\n" + "=" * 60)
+            logger.info("CYCLE %s", cycle)
+            logger.info("=" * 60)
+            
+            try:
+                team_decision = run_single_team_analysis(coordinator, symbol, loop)
+                if audit:
+                    audit.record(f"{symbol}-{cycle}-{int(time.time())}", team_decision)
+            except Exception as e:
+                logger.error("❌ Error: %s", e)
+            
+            deadline = next_deadline(deadline, interval)
+            wait = max(0.0, deadline - time.monotonic())
+            logger.info("\n💤 Next analysis in %.1fs...", wait)
+            time.sleep(wait)
+    finally:
+        if audit:
+            audit.close()
 
 
 def main():
@@ -128,56 +173,87 @@ def main():
                        help="Number of HFT cycles")
     parser.add_argument("--hft-interval", type=float, default=30,
                        help="Interval between HFT cycles in seconds")
+    parser.add_argument("--multiplex", action="store_true",
+                       help="Send all analyst prompts in a single GPT request")
+    parser.add_argument("--audit-batch", action="store_true",
+                       help="Queue per-cycle audit rationales for the OpenAI Batch API (continuous mode)")
+    parser.add_argument("--stream", action="store_true",
+                       help="Read ticker/depth/candles from the WEEX WebSocket feed (REST fallback)")
+    parser.add_argument("--async", dest="async_io", action="store_true",
+                       help="Fetch each tick's WEEX snapshot on one asyncio loop over HTTP/2")
     
     args = parser.parse_args()
     
+    # Fail before any network work if the config is incomplete
+    config = validate_config()
+    
+    configure_logging(logging.INFO)
+    
     print_banner()
     
-    print(f"📅 Started: {datetime.utcnow().isoformat()}")
-    print(f"🤖 Model: {config.GPT_MODEL}")
-    print(f"📊 Symbol: {args.symbol}")
-    print(f"🔄 Mode: {args.mode}")
+    logger.info("📅 Started: %s", datetime.utcnow().isoformat())
+    logger.info("🤖 Model: %s", config.GPT_MODEL)
+    logger.info("📊 Symbol: %s", args.symbol)
+    logger.info("🔄 Mode: %s", args.mode)
     
     # Initialize clients
-    print("\n🔗 Connecting to WEEX Exchange...")
-    weex_client = create_client(
+    logger.info("\n🔗 Connecting to WEEX Exchange...")
+    make_client = AsyncWeexClient if args.async_io else create_client
+    weex_client = make_client(
         api_key=config.WEEX_API_KEY,
         secret_key=config.WEEX_SECRET_KEY,
         passphrase=config.WEEX_PASSPHRASE,
         base_url=config.WEEX_BASE_URL
     )
+    if args.stream:
+        weex_client.attach_stream(
+            WeexWSClient([args.symbol], getattr(config, "WEEX_WS_URL", WS_URL)).start()
+        )
     
     ticker = weex_client.get_ticker(args.symbol)
-    print(f"✅ Connected! {args.symbol} = ${ticker.get('last')}")
+    logger.info("✅ Connected! %s = $%s", args.symbol, ticker.get('last'))
     
-    # Initialize OpenAI
-    print("\n🧠 Initializing AI Agents...")
-    openai_client = OpenAI(api_key=config.OPENAI_API_KEY)
+    # Initialize OpenAI (one pooled client shared by every agent)
+    logger.info("\n🧠 Initializing AI Agents...")
+    openai_client = create_openai_client(config.OPENAI_API_KEY)
     
     # Initialize Coordinator (sets up all agents)
     coordinator = CoordinatorAgent(
         openai_client=openai_client,
         weex_client=weex_client,
         model=config.GPT_MODEL,
-        max_position_size=config.MAX_POSITION_SIZE_BTC
+        max_position_size=config.MAX_POSITION_SIZE_BTC,
+        multiplex_gpt=args.multiplex
     )
     
-    print("✅ All 5 agents initialized!")
-    print("   📊 Market Analyst")
-    print("   💭 Sentiment Agent")
-    print("   🛡️ Risk Manager")
-    print("   ⚡ Executor")
-    print("   🎯 Coordinator")
+    logger.info("✅ All 5 agents initialized!")
+    logger.info("   📊 Market Analyst")
+    logger.info("   💭 Sentiment Agent")
+    logger.info("   🛡️ Risk Manager")
+    logger.info("   ⚡ Executor")
+    logger.info("   🎯 Coordinator")
+    
+    # With --async, one event loop (and one HTTP/2 connection) serves the whole run
+    loop = asyncio.new_event_loop() if args.async_io else None
     
     # Run based on mode
-    if args.mode == "hft":
-        run_hft_mode(coordinator, args.symbol, args.hft_cycles, args.hft_interval)
-    elif args.mode == "continuous":
-        run_continuous_team(coordinator, args.symbol, args.interval)
-    else:
-        run_single_team_analysis(coordinator, args.symbol)
-    
-    print("\n🏁 Fenyr Multi-Agent System finished.")
+    try:
+        if args.mode == "hft":
+            run_hft_mode(coordinator, args.symbol, args.hft_cycles, args.hft_interval, loop)
+        elif args.mode == "continuous":
+            audit = None
+            if args.audit_batch:
+                audit = BatchLogger(openai_client, config.GPT_MODEL, executor=weex_client.log_pool)
+                audit.collect_ready()  # rationales finished since the last run
+            run_continuous_team(coordinator, args.symbol, args.interval, audit, loop)
+        else:
+            run_single_team_analysis(coordinator, args.symbol, loop)
+    finally:
+        if loop is not None:
+            loop.run_until_complete(weex_client.aclose())
+            loop.close()
+    
+    logger.info("\n🏁 Fenyr Multi-Agent System finished.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+"""
+BatchLogger persistence: queued requests and submitted batch ids survive a
+restart, and finished batches are collected to the results file
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents import BatchLogger, Action, Signal
+from agents.base import AgentDecision
+from agents.coordinator import TeamDecision
+
+
+class FakeOpenAI:
+    """Just the files/batches surface BatchLogger touches"""
+    
+    def __init__(self):
+        self.uploads = []
+        self.status = {}
+        self.files = SimpleNamespace(create=self._upload, content=self._content)
+        self.batches = SimpleNamespace(create=self._create, retrieve=self._retrieve)
+    
+    def _upload(self, file, purpose):
+        self.uploads.append(file[1])
+        return SimpleNamespace(id=f"file-{len(self.uploads)}")
+    
+    def _create(self, input_file_id, endpoint, completion_window):
+        batch_id = f"batch-{len(self.status) + 1}"
+        self.status[batch_id] = "in_progress"
+        return SimpleNamespace(id=batch_id)
+    
+    def _retrieve(self, batch_id):
+        status = self.status[batch_id]
+        return SimpleNamespace(status=status, output_file_id="out-" + batch_id if status == "completed" else None)
+    
+    def _content(self, file_id):
+        payload = self.uploads[int(file_id.rsplit("-", 1)[1]) - 1]
+        lines = []
+        for line in payload.splitlines():
+            custom_id = orjson.loads(line)["custom_id"]
+            lines.append(orjson.dumps({
+                "custom_id": custom_id,
+                "response": {"body": {"choices": [{"message": {"content": f"why {custom_id}"}}]}}
+            }).decode())
+        return SimpleNamespace(text="\n".join(lines))
+
+
+def decision() -> TeamDecision:
+    analyst = AgentDecision("MarketAnalyst", "Technical Analysis", Signal.BUY, 0.8, "trend up", {})
+    return TeamDecision(Action.EXECUTE, "buy", "0.0002", 0.8, "go", [analyst])
+
+
+class BatchLoggerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "audit.jsonl")
+        self.results = os.path.join(self.dir.name, "results.jsonl")
+        self.openai = FakeOpenAI()
+    
+    def logger(self, **kwargs) -> BatchLogger:
+        return BatchLogger(self.openai, path=self.path, results_path=self.results, **kwargs)
+    
+    def test_submitted_batches_survive_restart_and_are_collected(self):
+        audit = self.logger()
+        audit.record("btc-1", decision())
+        audit.record("btc-2", decision())
+        batch_id = audit.flush()
+        self.assertFalse(os.path.exists(self.path))
+        
+        restarted = self.logger()
+        self.assertEqual(restarted.pending, [batch_id])
+        self.assertEqual(restarted.collect_ready(), 0)  # still running
+        
+        self.openai.status[batch_id] = "completed"
+        self.assertEqual(restarted.collect_ready(), 2)
+        self.assertEqual(restarted.pending, [])
+        with open(self.results, "rb") as f:
+            rows = [orjson.loads(line) for line in f]
+        self.assertEqual([r["custom_id"] for r in rows], ["btc-1", "btc-2"])
+        self.assertEqual(rows[0]["rationale"], "why btc-1")
+    
+    def test_failed_batch_is_dropped(self):
+        audit = self.logger()
+        audit.record("btc-1", decision())
+        batch_id = audit.flush()
+        self.openai.status[batch_id] = "expired"
+        self.assertEqual(audit.collect_ready(), 0)
+        self.assertEqual(audit.pending, [])
+    
+    def test_failed_upload_keeps_queue_for_retry(self):
+        audit = self.logger()
+        audit.record("btc-1", decision())
+        create = self.openai.batches.create
+        self.openai.batches.create = lambda **kw: (_ for _ in ()).throw(ConnectionError("down"))
+        with self.assertRaises(ConnectionError):
+            audit.flush()
+        audit.record("btc-2", decision())  # lands in a fresh queue file
+        
+        self.openai.batches.create = create
+        audit.flush()  # the staged upload goes first
+        audit.flush()
+        self.assertEqual(len(audit.pending), 2)
+        self.assertIn(b'"btc-1"', self.openai.uploads[-2])
+        self.assertIn(b'"btc-2"', self.openai.uploads[-1])
+    
+    def test_due_flush_runs_on_executor(self):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            audit = self.logger(flush_interval=0, executor=pool)
+            audit.record("btc-1", decision())
+            audit._flush_future.result()
+        self.assertEqual(len(audit.pending), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+WeexClient candle parsing: malformed rows are dropped instead of failing
+the whole table
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from weex_client import WeexClient
+
+
+class CandlesNpTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = WeexClient("key", "secret", "pass", "https://rest.invalid", cache_ttl=0)
+    
+    def test_non_numeric_rows_are_dropped(self):
+        self.client.get_candles = lambda *args: [
+            ["1000", "1", "1", "1", "2", "1"],
+            ["2000", None, "1", "1", "3", "1"],
+            ["3000", "1", "1", "1", "", "1"],
+            ["4000", "1"],
+            ["5000", "1", "1", "1", "5", "1"]
+        ]
+        candles = self.client.get_candles_np("cmt_btcusdt")
+        self.assertEqual(candles["ts"].tolist(), [1000, 5000])
+        self.assertEqual(candles["close"].tolist(), [2.0, 5.0])
+    
+    def test_error_response_gives_empty_columns(self):
+        self.client.get_candles = lambda *args: {"code": "40001"}
+        self.assertEqual(len(self.client.get_candles_np("cmt_btcusdt")["close"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
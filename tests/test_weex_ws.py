@@ -0,0 +1,125 @@
+"""
+WeexWSClient frame conversion, using the example pushes from the WEEX v3
+contract WebSocket docs (Tickers, Depth and Candlesticks channels)
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from weex_client import WeexClient, WeexWSClient
+
+SYMBOL = "cmt_ethusdt"
+
+TICKER_FRAME = {
+    "e": "ticker",
+    "E": 1776081628845,
+    "s": "ETHUSDT",
+    "d": [{
+        "p": "-18.93", "P": "-0.008592", "w": "2192.40298388", "c": "2184.20",
+        "o": "2203.13", "h": "2217.34", "l": "2173.32", "v": "359395.800",
+        "q": "787940424.31399", "O": 1775995200000, "C": 1776081600000,
+        "n": 485169, "m": "2184.28", "i": "2185.2025"
+    }]
+}
+
+DEPTH_SNAPSHOT = {
+    "e": "depthSnapshot",
+    "E": 1776098967000,
+    "s": "ETHUSDT",
+    "U": 14181847700,
+    "u": 14181847789,
+    "l": 15,
+    "b": [["2227.20", "40.000"], ["2227.10", "12.500"]],
+    "a": [["2227.21", "30.000"], ["2227.26", "8.100"]]
+}
+
+DEPTH_DELTA = {
+    "e": "depth",
+    "E": 1776098967972,
+    "s": "ETHUSDT",
+    "U": 14181847790,
+    "u": 14181847802,
+    "l": 200,
+    "d": "CHANGED",
+    "b": [["2227.21", "0"], ["2227.20", "46.519"]],
+    "a": [["2227.21", "44.092"], ["2227.26", "0"]]
+}
+
+KLINE_FRAME = {
+    "e": "kline",
+    "E": 1776095535012,
+    "s": "ETHUSDT",
+    "p": "LAST_PRICE",
+    "d": [{
+        "t": 1776092400000, "T": 1776096000000, "s": "ETHUSDT", "i": "1h",
+        "o": "2234.18", "c": "2205.15", "h": "2236.43", "l": "2199.53",
+        "v": "12505.60574", "n": 3381, "q": "27682528.6655305",
+        "V": "6420.47929", "Q": "14213680.1906424"
+    }]
+}
+
+
+class WeexWSClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = WeexWSClient([SYMBOL])
+    
+    def test_subscribes_to_v3_channel_names(self):
+        self.assertEqual(self.stream.subscriptions(), [
+            "ETHUSDT@ticker", "ETHUSDT@depth15", "ETHUSDT@kline_1h_LAST_PRICE"
+        ])
+    
+    def test_ticker_push_becomes_rest_ticker(self):
+        self.assertTrue(self.stream._apply(TICKER_FRAME))
+        ticker = self.stream.get("ticker", SYMBOL)
+        self.assertEqual(ticker["last"], "2184.20")
+        self.assertEqual(ticker["high_24h"], "2217.34")
+        self.assertEqual(ticker["low_24h"], "2173.32")
+        self.assertEqual(ticker["volume_24h"], "359395.800")
+        self.assertEqual(ticker["priceChangePercent"], "-0.008592")
+    
+    def test_malformed_ticker_is_rejected(self):
+        for data in ([], [["2184.20"]], [{"c": None}], [{"c": "0"}], {"c": "2184.20"}):
+            self.assertFalse(self.stream._apply({**TICKER_FRAME, "d": data}))
+        self.assertIsNone(self.stream.get("ticker", SYMBOL))
+    
+    def test_depth_snapshot_then_delta(self):
+        self.assertFalse(self.stream._apply(DEPTH_DELTA))  # no book before a snapshot
+        self.assertTrue(self.stream._apply(DEPTH_SNAPSHOT))
+        self.assertTrue(self.stream._apply(DEPTH_DELTA))
+        depth = self.stream.get("depth", SYMBOL)
+        self.assertEqual(depth["bids"], [["2227.20", "46.519"], ["2227.10", "12.500"]])
+        self.assertEqual(depth["asks"], [["2227.21", "44.092"]])
+    
+    def test_malformed_depth_is_rejected(self):
+        self.assertFalse(self.stream._apply({**DEPTH_SNAPSHOT, "b": [["x", "1"]]}))
+        self.assertFalse(self.stream._apply({**DEPTH_SNAPSHOT, "a": "2227.21"}))
+        self.assertIsNone(self.stream.get("depth", SYMBOL))
+    
+    def test_kline_extends_rest_history(self):
+        self.assertFalse(self.stream._apply(KLINE_FRAME))  # needs a REST seed first
+        seed = [["1776085200000", "1", "1", "1", "2230.00", "1"], ["1776088800000", "1", "1", "1", "2234.18", "1"]]
+        self.stream.seed_candles(SYMBOL, "1h", seed)
+        self.assertTrue(self.stream._apply(KLINE_FRAME))
+        rows = self.stream.candles(SYMBOL, "1h", 3)
+        self.assertEqual(rows[-1], ["1776092400000", "2234.18", "2236.43", "2199.53", "2205.15", "12505.60574"])
+        self.assertEqual(rows[:2], seed)
+    
+    def test_frames_for_other_symbols_are_ignored(self):
+        self.assertFalse(self.stream._apply({**TICKER_FRAME, "s": "BTCUSDT"}))
+    
+    def test_client_falls_back_to_rest_until_stream_is_valid(self):
+        client = WeexClient("key", "secret", "pass", "https://rest.invalid", cache_ttl=0)
+        client._public_get_url = lambda url: {"last": "rest"}
+        client.attach_stream(self.stream)
+        self.stream._apply({**TICKER_FRAME, "d": [{"c": "bad"}]})
+        self.assertEqual(client.get_ticker(SYMBOL), {"last": "rest"})
+        self.stream._apply(TICKER_FRAME)
+        self.assertEqual(client.get_ticker(SYMBOL)["last"], "2184.20")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -27,7 +27,7 @@ TRADING_TOOLS = [
         "type": "function",
         "function": {
             "name": "get_technical_indicators",
-            "description": "Calculate technical indicators (RSI, EMA, MACD) from recent price data. Use this to identify trading signals based on technical analysis.",
+            "description": "Calculate technical indicators (RSI, EMA, MACD, Bollinger Bands) from recent price data. Use this to identify trading signals based on technical analysis.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -85,6 +85,10 @@ TRADING_TOOLS = [
                     "reasoning": {
                         "type": "string",
                         "description": "Detailed reasoning for this trade decision. This will be logged for compliance."
+                    },
+                    "market_price": {
+                        "type": "number",
+                        "description": "Last price from the market data you analyzed this turn (optional; the trade is rejected if it is 1% or more away from the ticker)"
                     }
                 },
                 "required": ["symbol", "action", "size", "confidence", "reasoning"]
@@ -167,6 +171,10 @@ Your objective is to analyze market data and make profitable trading decisions w
 4. Analyze the data and form a thesis
 5. If conditions are favorable, execute a trade with full reasoning
 
+## Tool Usage:
+- Emit ALL the data tool calls you need (steps 1-3) together in a single message; they run in parallel. Do not chain them one per message.
+- After the results come back, either execute the trade or give your final answer.
+
 Be analytical, data-driven, and always explain your thought process.
 """
 
@@ -178,3 +186,7 @@ ACTION_TO_SIDE = {
     "open_short": 3,
     "close_long": 4
 }
+
+
+# Tools that change account state - never run concurrently
+WRITE_TOOLS = frozenset({"execute_trade", "set_stop_loss_take_profit"})